@@ -1,5 +1,5 @@
 """Clients pour les APIs externes."""
 
-from .overpass_client import OverpassClient
+from .overpass_client import AsyncOverpassClient, OverpassClient
 
-__all__ = ["OverpassClient"]
\ No newline at end of file
+__all__ = ["AsyncOverpassClient", "OverpassClient"]
\ No newline at end of file
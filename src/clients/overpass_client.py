@@ -1,12 +1,186 @@
 """Client pour l'API Overpass."""
 
+import asyncio
+import contextlib
+import logging
+import random
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import takewhile
 from typing import Any
 
+import httpx
+import ijson
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+from urllib3.exceptions import MaxRetryError
+from urllib3.util import Retry
+from urllib3.util.retry import RequestHistory
 
 from ..config import DEFAULT_CONFIG, OverpassConfig
 
+logger = logging.getLogger(__name__)
+
+# Codes HTTP pour lesquels une nouvelle tentative a du sens
+# (408 : délai dépassé, 429 : quota Overpass dépassé, 5xx : serveur
+# surchargé). Les autres erreurs 4xx sont définitives et levées aussitôt.
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+USER_AGENT = "OverPassAPI/0.1.0 (+https://github.com/ViaAutFaciam/OverPassAPI)"
+
+# Délai maximal d'établissement de la connexion (s). Le délai de lecture,
+# `OverpassConfig.timeout`, reste long : Overpass peut calculer longtemps
+# avant de répondre, mais un serveur injoignable doit échouer vite.
+CONNECT_TIMEOUT = 5.0
+
+# Requêtes simultanées accordées par adresse IP par les instances publiques
+# d'Overpass (overpass-api.de, voir /api/status) : au-delà, le serveur
+# répond 429. Plafond par défaut de `map_queries`.
+OVERPASS_SLOTS = 2
+
+# Bibliothèques HTTP utilisables par OverpassClient (OverpassConfig.http_backend)
+HTTP_BACKENDS = ("requests", "httpx")
+
+# Erreurs réseau ou HTTP levées par l'un ou l'autre backend
+HTTP_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+
+
+def _is_error(entry: RequestHistory) -> bool:
+    """Indique si une entrée de l'historique Retry est une erreur."""
+    return entry.redirect_location is None
+
+
+class _OverpassRetry(Retry):
+    """
+    Politique Retry d'urllib3 qui attend dès la première nouvelle tentative.
+
+    urllib3 2.x ne temporise pas tant qu'une seule erreur est survenue
+    (`get_backoff_time` renvoie 0) : la première nouvelle tentative partirait
+    aussitôt, sans aléa. Ici, la n-ième attente vaut
+    `backoff_factor * 2**(n - 1)` plus un aléa de 0 à `backoff_jitter`
+    secondes, plafonnée à `backoff_max`, comme la durée lue dans
+    l'en-tête Retry-After.
+    """
+
+    def get_backoff_time(self) -> float:
+        """
+        Calcule l'attente avant la prochaine tentative.
+
+        Returns:
+            Durée d'attente en secondes
+        """
+        # Seules les erreurs consécutives comptent (les redirections non)
+        errors = sum(1 for _ in takewhile(_is_error, reversed(self.history)))
+        if errors == 0:
+            return 0.0
+        delay = self.backoff_factor * 2 ** (errors - 1)
+        delay += random.uniform(0, self.backoff_jitter)
+        return min(delay, self.backoff_max)
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        """
+        Lit l'en-tête Retry-After, plafonné à `backoff_max`.
+
+        Args:
+            retry_after: Valeur de l'en-tête (secondes ou date HTTP)
+
+        Returns:
+            Durée d'attente en secondes
+        """
+        return min(super().parse_retry_after(retry_after), self.backoff_max)
+
+
+def _build_retry(config: OverpassConfig) -> Retry:
+    """
+    Construit la politique de nouvelles tentatives des clients Overpass.
+
+    Les tentatives sont gérées par urllib3 avec un backoff exponentiel
+    (`retry_delay`, puis le double à chaque échec) qui respecte
+    l'en-tête Retry-After renvoyé par Overpass (429/503).
+    `max_retries` correspond au nombre total de tentatives. Chaque
+    attente reçoit un aléa de 0 à `jitter` secondes, pour éviter que
+    des clients concurrents ne réessaient en même temps, et est
+    plafonnée à `max_delay` secondes.
+
+    Args:
+        config: Configuration d'Overpass
+
+    Returns:
+        Politique Retry (HTTPAdapter de requests, ou
+        `OverpassClient._send_with_retry` pour httpx)
+    """
+    return _OverpassRetry(
+        total=max(config.max_retries - 1, 0),
+        backoff_factor=config.retry_delay,
+        backoff_jitter=config.jitter,
+        backoff_max=config.max_delay,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _next_retry(
+    retry: Retry, response: httpx.Response, url: str
+) -> tuple[Retry, float] | None:
+    """
+    Décide si une réponse httpx doit être réessayée, et après quelle attente.
+
+    Args:
+        retry: Politique Retry courante
+        response: Réponse reçue
+        url: URL interrogée
+
+    Returns:
+        La politique mise à jour et l'attente en secondes, ou None si la
+        réponse est définitive ou si les tentatives sont épuisées
+    """
+    if not retry.is_retry(
+        "GET", response.status_code, "Retry-After" in response.headers
+    ):
+        return None
+    try:
+        retry = retry.increment("GET", url)
+    except MaxRetryError:
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return retry, retry.parse_retry_after(retry_after)
+    return retry, retry.get_backoff_time()
+
+
+def _decode(response: Any) -> Any:
+    """
+    Décode le corps JSON d'une réponse avec orjson.
+
+    Args:
+        response: Réponse requests ou httpx
+
+    Returns:
+        Données JSON décodées
+
+    Raises:
+        requests.exceptions.JSONDecodeError: Si le corps n'est pas du JSON
+            (réponse requests, comme `response.json()`)
+        httpx.DecodingError: Si le corps n'est pas du JSON (réponse httpx)
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        if isinstance(response, httpx.Response):
+            raise httpx.DecodingError(
+                f"Réponse JSON invalide : {e}", request=response.request
+            ) from e
+        raise requests.exceptions.JSONDecodeError(
+            e.msg, e.doc, e.pos, response=response
+        ) from e
+
 
 class OverpassClient:
     """
@@ -15,6 +189,24 @@ class OverpassClient:
     Ce client gère la communication avec l'API Overpass,
     les tentatives de nouvelle connexion et les erreurs.
 
+    Les requêtes passent par une session HTTP persistante afin de
+    réutiliser les connexions TCP/TLS (keep-alive) entre les appels.
+    Avec `http_backend="httpx"`, la session est un `httpx.Client` en
+    HTTP/2 : les requêtes parallèles de `map_queries` sont multiplexées
+    sur une même connexion TLS.
+    Les réponses sont mises en cache (LRU de `query_cache_size` entrées,
+    valides `query_cache_ttl` secondes) par requête normalisée : une
+    requête identique ne refait pas d'aller-retour réseau. Le cache
+    conserve le corps JSON brut, décodé à nouveau à chaque lecture :
+    chaque appel reçoit ainsi un dictionnaire indépendant. Une taille
+    nulle désactive le cache.
+    Le client peut être partagé entre threads (voir `map_queries`).
+    Le client peut être utilisé comme gestionnaire de contexte pour
+    libérer les connexions du pool :
+
+        >>> with OverpassClient() as client:
+        ...     data = client.query("[bbox:0,0,0.1,0.1];node;out;")
+
     Attributes:
         config: Configuration d'Overpass
     """
@@ -25,64 +217,419 @@ class OverpassClient:
 
         Args:
             config: Configuration personnalisée (défaut: DEFAULT_CONFIG)
+
+        Raises:
+            ValueError: Si le backend HTTP configuré est inconnu
         """
         self.config = config or DEFAULT_CONFIG
+        self._session: requests.Session | httpx.Client
+        self._status_retry: Retry | None = None
+        connect_timeout = min(CONNECT_TIMEOUT, self.config.timeout)
+        if self.config.http_backend == "requests":
+            self._timeout = (connect_timeout, self.config.timeout)
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=self.config.pool_size,
+                pool_maxsize=self.config.pool_size,
+                max_retries=_build_retry(self.config),
+            )
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        elif self.config.http_backend == "httpx":
+            # Le transport httpx ne réessaie que les erreurs de connexion :
+            # les codes 408/429/5xx sont réessayés par _send_with_retry()
+            self._timeout = httpx.Timeout(
+                self.config.timeout, connect=connect_timeout
+            )
+            self._session = httpx.Client(
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=self.config.pool_size,
+                        max_keepalive_connections=self.config.pool_size,
+                    ),
+                    retries=max(self.config.max_retries - 1, 0),
+                ),
+                timeout=self._timeout,
+                headers={"User-Agent": USER_AGENT},
+            )
+            self._status_retry = _build_retry(self.config)
+        else:
+            raise ValueError(
+                f"Backend HTTP inconnu : {self.config.http_backend!r} "
+                f"(attendu : {', '.join(HTTP_BACKENDS)})"
+            )
+        self._qcache: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._qcache_max = self.config.query_cache_size
+        self._qcache_ttl = self.config.query_cache_ttl
+        self._qcache_lock = threading.Lock()
+        self._avail_cache = False
+        self._avail_expires = 0.0
+
+    def _get(self, params: dict[str, str]) -> Any:
+        """
+        Envoie une requête GET à l'API Overpass.
+
+        Args:
+            params: Paramètres de la requête
+
+        Returns:
+            Réponse HTTP du backend
+
+        Raises:
+            requests.exceptions.RequestException: Erreur réseau (requests)
+            httpx.HTTPError: Erreur réseau (httpx)
+        """
+        return self._send_with_retry(
+            lambda: self._session.get(
+                self.config.url, params=params, timeout=self._timeout
+            )
+        )
+
+    def _send_with_retry(self, send: Callable[[], Any]) -> Any:
+        """
+        Envoie une requête en réessayant les réponses 408/429/5xx (httpx).
+
+        Avec le backend httpx, les codes d'erreur sont réessayés ici selon
+        la même politique que l'adaptateur requests (backoff, aléa,
+        plafond et en-tête Retry-After) ; avec requests, l'adaptateur
+        s'en charge et la réponse est renvoyée telle quelle. Les réponses
+        abandonnées sont fermées, y compris si une exception interrompt
+        les tentatives.
+
+        Args:
+            send: Fonction envoyant la requête et renvoyant la réponse
+
+        Returns:
+            Dernière réponse reçue
+        """
+        response = send()
+        retry = self._status_retry
+        try:
+            while retry is not None and (
+                step := _next_retry(retry, response, self.config.url)
+            ):
+                retry, delay = step
+                response.close()
+                time.sleep(delay)
+                response = send()
+        except BaseException:
+            response.close()
+            raise
+        return response
 
     def query(self, overpass_ql: str) -> dict[str, Any]:
         """
         Exécute une requête Overpass QL.
 
-        Effectue des tentatives automatiques en cas d'erreur.
+        Les tentatives automatiques (erreurs réseau, 429, 5xx) sont
+        effectuées par l'adaptateur HTTP de la session. Une requête déjà
+        exécutée dans la durée de validité du cache n'est pas renvoyée.
+        Le corps est décodé avec orjson, bien plus rapide que le module
+        json standard sur les réponses riches en coordonnées.
 
         Args:
             overpass_ql: Requête en langage Overpass QL
 
         Returns:
-            Dictionnaire contenant les données en JSON
+            Dictionnaire contenant les données en JSON (copie modifiable)
 
         Raises:
-            requests.exceptions.RequestException: Si toutes les tentatives échouent
+            requests.exceptions.RequestException: Si toutes les tentatives
+                échouent ou si le corps n'est pas du JSON (backend requests)
+            httpx.HTTPError: Si toutes les tentatives échouent ou si le
+                corps n'est pas du JSON (backend httpx)
         """
-        for attempt in range(self.config.max_retries):
-            try:
-                response = requests.get(
-                    self.config.url,
-                    params={"data": overpass_ql},
-                    timeout=self.config.timeout,
-                )
-                response.raise_for_status()
-                return response.json()
-
-            except requests.exceptions.RequestException as e:
-                if attempt < self.config.max_retries - 1:
-                    wait_time = self.config.retry_delay * (2 ** attempt)
-                    print(
-                        f"Tentative {attempt + 1} échouée. "
-                        f"Nouvelle tentative dans {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
+        key = " ".join(overpass_ql.split())
+        now = time.monotonic()
+        with self._qcache_lock:
+            cached = self._qcache.get(key)
+            if cached is not None:
+                expires, content = cached
+                if now < expires:
+                    self._qcache.move_to_end(key)
                 else:
-                    print(
-                        f"Erreur après {self.config.max_retries} tentatives : {e}"
-                    )
-                    raise
+                    del self._qcache[key]
+                    cached = None
+        if cached is not None:
+            return orjson.loads(content)
+
+        try:
+            response = self._get({"data": overpass_ql})
+            response.raise_for_status()
+            content = response.content
+            data = _decode(response)
 
-        return {}
+        except HTTP_ERRORS as e:
+            # Le nombre de tentatives dépend de l'erreur (aucune nouvelle
+            # tentative sur une 4xx) : il n'est pas repris dans le message
+            logger.warning("Échec de la requête Overpass : %s", e)
+            raise
+
+        if self._qcache_max <= 0:
+            return data
+
+        with self._qcache_lock:
+            self._qcache[key] = (now + self._qcache_ttl, content)
+            if len(self._qcache) > self._qcache_max:
+                self._qcache.popitem(last=False)
+        return data
+
+    def map_queries(
+        self, queries: list[str], max_workers: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Exécute plusieurs requêtes Overpass QL en parallèle.
+
+        Les requêtes partagent la session (et son pool de connexions) ;
+        requests relâchant le GIL pendant les entrées/sorties réseau,
+        le gain est quasi linéaire jusqu'à la limite de requêtes
+        simultanées du serveur Overpass. Par défaut, le parallélisme suit
+        la taille du pool (`pool_size`), plafonnée à `OVERPASS_SLOTS` :
+        les instances publiques n'accordent que peu de créneaux par adresse
+        IP et répondent 429 au-delà. `max_parallel_queries` lève ce
+        plafond pour une instance privée.
+
+        Args:
+            queries: Requêtes en langage Overpass QL
+            max_workers: Nombre maximal de requêtes simultanées (défaut:
+                `max_parallel_queries`, sinon `min(pool_size, OVERPASS_SLOTS)`)
+
+        Returns:
+            Réponses JSON, dans l'ordre des requêtes
+
+        Raises:
+            requests.exceptions.RequestException: Si une requête échoue
+                (backend requests)
+            httpx.HTTPError: Si une requête échoue (backend httpx)
+        """
+        limit = (
+            max_workers
+            or self.config.max_parallel_queries
+            or min(self.config.pool_size, OVERPASS_SLOTS)
+        )
+        workers = min(limit, len(queries)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.query, queries))
+
+    def query_stream(self, overpass_ql: str) -> Iterator[dict[str, Any]]:
+        """
+        Exécute une requête Overpass QL et itère sur ses éléments.
+
+        La réponse est lue en flux et décodée au fil de l'eau : chaque
+        élément est produit dès sa réception, sans charger le document
+        complet en mémoire. Les réponses ne sont pas mises en cache.
+
+        Args:
+            overpass_ql: Requête en langage Overpass QL
+
+        Yields:
+            Éléments Overpass (dictionnaires) un par un
+
+        Raises:
+            requests.exceptions.RequestException: Si la requête échoue
+                (backend requests)
+            httpx.HTTPError: Si la requête échoue (backend httpx)
+        """
+        if isinstance(self._session, httpx.Client):
+            yield from self._query_stream_httpx(overpass_ql)
+            return
+
+        response = self._session.get(
+            self.config.url,
+            params={"data": overpass_ql},
+            timeout=self._timeout,
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, "elements.item", use_float=True)
+        finally:
+            response.close()
+
+    def _query_stream_httpx(self, overpass_ql: str) -> Iterator[dict[str, Any]]:
+        """
+        Variante de `query_stream` pour le backend httpx.
+
+        httpx ne fournit pas d'objet fichier : les blocs reçus sont
+        poussés dans le parseur incrémental d'ijson. Les réponses
+        408/429/5xx sont réessayées par `_send_with_retry`, comme dans
+        `_get`, avant la lecture du corps.
+
+        Args:
+            overpass_ql: Requête en langage Overpass QL
+
+        Yields:
+            Éléments Overpass (dictionnaires) un par un
+        """
+        request = self._session.build_request(
+            "GET",
+            self.config.url,
+            params={"data": overpass_ql},
+            timeout=self._timeout,
+        )
+        with contextlib.closing(
+            self._send_with_retry(lambda: self._session.send(request, stream=True))
+        ) as response:
+            response.raise_for_status()
+            elements = ijson.sendable_list()
+            parser = ijson.items_coro(elements, "elements.item", use_float=True)
+            for chunk in response.iter_bytes():
+                parser.send(chunk)
+                yield from elements
+                del elements[:]
+            parser.close()
+            yield from elements
+
+    def clear_query_cache(self) -> None:
+        """Vide le cache des réponses."""
+        with self._qcache_lock:
+            self._qcache.clear()
 
     def is_available(self) -> bool:
         """
         Vérifie si l'API Overpass est disponible.
 
+        Le résultat est mémorisé pendant `availability_ttl` secondes :
+        des vérifications répétées avant chaque requête ne sollicitent
+        pas le serveur (voir `invalidate_availability`). La sonde réutilise
+        les connexions et les en-têtes de la session, mais n'est pas
+        réessayée : avec requests, elle passe directement par le pool
+        urllib3 de l'adaptateur, sans sa politique Retry. Un serveur
+        surchargé est ainsi détecté en une seule requête.
+
         Returns:
             True si disponible, False sinon.
         """
+        now = time.monotonic()
+        if now < self._avail_expires:
+            return self._avail_cache
+
+        params = {"data": "[bbox:0,0,0.1,0.1];node;out count;"}
         try:
-            simple_query = "[bbox:0,0,0.1,0.1];node;out count;"
-            response = requests.get(
-                self.config.url,
-                params={"data": simple_query},
-                timeout=5,
-            )
-            return response.status_code == 200
-        except requests.exceptions.RequestException:
-            return False
\ No newline at end of file
+            if isinstance(self._session, httpx.Client):
+                response = self._session.get(
+                    self.config.url, params=params, timeout=5
+                )
+                status = response.status_code
+            else:
+                adapter = self._session.get_adapter(self.config.url)
+                response = adapter.poolmanager.request(
+                    "GET",
+                    self.config.url,
+                    fields=params,
+                    headers=dict(self._session.headers),
+                    retries=False,
+                    timeout=5,
+                )
+                status = response.status
+            available = status == 200
+        except (*HTTP_ERRORS, Urllib3Error):
+            available = False
+
+        self._avail_cache = available
+        self._avail_expires = now + self.config.availability_ttl
+        return available
+
+    def invalidate_availability(self) -> None:
+        """Force la prochaine vérification de disponibilité."""
+        self._avail_expires = 0.0
+
+    def close(self) -> None:
+        """Ferme la session HTTP et libère les connexions du pool."""
+        self._session.close()
+
+    def __enter__(self) -> "OverpassClient":
+        """Entre dans le gestionnaire de contexte."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Ferme la session à la sortie du gestionnaire de contexte."""
+        self.close()
+
+
+class AsyncOverpassClient:
+    """
+    Client asynchrone pour l'API Overpass.
+
+    Basé sur `httpx.AsyncClient` (HTTP/2, pool de `pool_size`
+    connexions), il permet de lancer plusieurs requêtes en parallèle avec
+    `asyncio.gather` au lieu de les enchaîner. Les réponses 408/429/5xx
+    sont réessayées selon la même politique que `OverpassClient`.
+
+        >>> async with AsyncOverpassClient() as client:
+        ...     results = await asyncio.gather(client.query(q1), client.query(q2))
+
+    Attributes:
+        config: Configuration d'Overpass
+    """
+
+    def __init__(self, config: OverpassConfig | None = None):
+        """
+        Initialise le client asynchrone.
+
+        Args:
+            config: Configuration personnalisée (défaut: DEFAULT_CONFIG)
+        """
+        self.config = config or DEFAULT_CONFIG
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.config.pool_size,
+                max_keepalive_connections=self.config.pool_size,
+            ),
+            retries=max(self.config.max_retries - 1, 0),
+        )
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                self.config.timeout,
+                connect=min(CONNECT_TIMEOUT, self.config.timeout),
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+        self._retry = _build_retry(self.config)
+
+    async def query(self, overpass_ql: str) -> dict[str, Any]:
+        """
+        Exécute une requête Overpass QL.
+
+        Args:
+            overpass_ql: Requête en langage Overpass QL
+
+        Returns:
+            Dictionnaire contenant les données en JSON
+
+        Raises:
+            httpx.HTTPError: Si la requête échoue ou si le corps n'est pas
+                du JSON (`httpx.DecodingError`)
+        """
+        params = {"data": overpass_ql}
+        try:
+            response = await self._client.get(self.config.url, params=params)
+            retry = self._retry
+            while step := _next_retry(retry, response, self.config.url):
+                retry, delay = step
+                await response.aclose()
+                await asyncio.sleep(delay)
+                response = await self._client.get(self.config.url, params=params)
+            response.raise_for_status()
+            return _decode(response)
+
+        except httpx.HTTPError as e:
+            logger.warning("Erreur lors de la requête asynchrone : %s", e)
+            raise
+
+    async def aclose(self) -> None:
+        """Ferme le client HTTP et libère les connexions du pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncOverpassClient":
+        """Entre dans le gestionnaire de contexte asynchrone."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Ferme le client à la sortie du gestionnaire de contexte."""
+        await self.aclose()
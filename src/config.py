@@ -16,6 +16,18 @@ class OverpassConfig:
     timeout: int = 30
     max_retries: int = 3
     retry_delay: float = 1.0
+    jitter: float = 0.5
+    max_delay: float = 30.0
+    cache_size: int = 10_000
+    pool_size: int = 16
+    # Requêtes simultanées de map_queries. Défaut : pool_size, plafonné aux
+    # créneaux par adresse IP des instances publiques d'Overpass
+    # (OVERPASS_SLOTS) ; à relever pour une instance privée.
+    max_parallel_queries: int | None = None
+    availability_ttl: float = 30.0
+    query_cache_size: int = 256
+    query_cache_ttl: float = 600.0
+    http_backend: str = "requests"
 
 
 # Configuration par défaut
@@ -0,0 +1,56 @@
+"""
+Noyaux de calcul géométrique.
+
+Si Numba est installé (extra `fast`), la formule de Shoelace est compilée
+en code natif ; sinon une version vectorisée NumPy équivalente est utilisée.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    njit = None
+
+
+def _shoelace_numpy(a: np.ndarray) -> float:
+    """
+    Aire d'un anneau fermé (n, 2) par la formule de Shoelace, via NumPy.
+
+    Args:
+        a: Tableau (n, 2) de float64 dont le dernier point égale le premier
+
+    Returns:
+        Aire en unités de coordonnées au carré
+    """
+    x = a[:, 0]
+    y = a[:, 1]
+    return 0.5 * abs(float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1])))
+
+
+def _shoelace_loop(a: np.ndarray) -> float:
+    """
+    Aire d'un anneau fermé (n, 2) par la formule de Shoelace, en boucle.
+
+    Destinée à être compilée par Numba : une multiplication-addition
+    par arête sur un tampon contigu.
+
+    Args:
+        a: Tableau (n, 2) de float64 dont le dernier point égale le premier
+
+    Returns:
+        Aire en unités de coordonnées au carré
+    """
+    s = 0.0
+    n = a.shape[0] - 1
+    for i in range(n):
+        s += a[i, 0] * a[i + 1, 1] - a[i + 1, 0] * a[i, 1]
+    return abs(s) * 0.5
+
+
+if njit is not None:
+    shoelace = njit(cache=True, fastmath=True)(_shoelace_loop)
+    # Compilation anticipée : le premier appel réel ne paie pas le JIT
+    shoelace(np.zeros((3, 2), dtype=np.float64))
+else:  # pragma: no cover - dépend de l'environnement
+    shoelace = _shoelace_numpy
@@ -2,8 +2,12 @@
 
 from dataclasses import dataclass
 
+# Bornes des coordonnées géographiques (degrés)
+LAT_MIN, LAT_MAX = -90.0, 90.0
+LON_MIN, LON_MAX = -180.0, 180.0
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class BoundingBox:
     """
     Représente une bounding box géographique.
@@ -11,6 +15,11 @@ class BoundingBox:
     Format : (sud, ouest, nord, est)
     ou (lat_min, lon_min, lat_max, lon_max)
 
+    La bbox est immuable (donc hashable) ; sa validité et sa
+    représentation Overpass sont calculées à la demande.
+    Elle utilise des slots (pas de `__dict__` par instance), ce qui
+    compte lorsqu'une zone est découpée en milliers de tuiles.
+
     Attributes:
         lat_min: Latitude minimale (sud)
         lon_min: Longitude minimale (ouest)
@@ -37,6 +46,34 @@ class BoundingBox:
         """
         return f"({self.lat_min},{self.lon_min},{self.lat_max},{self.lon_max})"
 
+    def split(self, tiles_x: int, tiles_y: int) -> list["BoundingBox"]:
+        """
+        Découpe la bbox en une grille de tuiles de même taille.
+
+        Args:
+            tiles_x: Nombre de tuiles en longitude (ouest → est)
+            tiles_y: Nombre de tuiles en latitude (sud → nord)
+
+        Returns:
+            Liste des tuiles, ligne par ligne du sud au nord
+
+        Raises:
+            ValueError: Si le nombre de tuiles est inférieur à 1
+        """
+        if tiles_x < 1 or tiles_y < 1:
+            raise ValueError("Le nombre de tuiles doit être au moins 1")
+
+        lat_step = (self.lat_max - self.lat_min) / tiles_y
+        lon_step = (self.lon_max - self.lon_min) / tiles_x
+        lats = [self.lat_min + i * lat_step for i in range(tiles_y)] + [self.lat_max]
+        lons = [self.lon_min + j * lon_step for j in range(tiles_x)] + [self.lon_max]
+
+        return [
+            BoundingBox(lats[i], lons[j], lats[i + 1], lons[j + 1])
+            for i in range(tiles_y)
+            for j in range(tiles_x)
+        ]
+
     def __str__(self) -> str:
         """Représentation string de la bbox."""
         return self.to_overpass()
@@ -48,16 +85,7 @@ class BoundingBox:
         Returns:
             True si les coordonnées sont valides, False sinon.
         """
-        if self.lat_min >= self.lat_max:
-            return False
-        if self.lon_min >= self.lon_max:
-            return False
-        if not (-90 <= self.lat_min <= 90):
-            return False
-        if not (-90 <= self.lat_max <= 90):
-            return False
-        if not (-180 <= self.lon_min <= 180):
-            return False
-        if not (-180 <= self.lon_max <= 180):
-            return False
-        return True
\ No newline at end of file
+        return (
+            LAT_MIN <= self.lat_min < self.lat_max <= LAT_MAX
+            and LON_MIN <= self.lon_min < self.lon_max <= LON_MAX
+        )
\ No newline at end of file
@@ -1,27 +1,51 @@
 """Modèle pour les polygones."""
 
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 from typing import Any
 
+import numpy as np
 
-class PolygonType(Enum):
-    """Types de polygones OSM."""
+from ._geom_kernels import shoelace
+
+
+class PolygonType(StrEnum):
+    """
+    Types de polygones OSM.
+
+    Chaque membre est aussi la chaîne correspondante (`PolygonType.WAY
+    == "way"`) : il se compare et se sérialise sans passer par `.value`.
+    """
 
     WAY = "way"
     RELATION = "relation"
     NODE = "node"
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Polygon:
     """
     Représente un polygone OpenStreetMap.
 
+    Les coordonnées sont stockées dans un tableau NumPy contigu de forme
+    (n, 2) et de type float64 (16 octets par sommet) ; une liste de paires
+    [lon, lat] passée au constructeur est convertie automatiquement, toute
+    autre forme (points (lon, lat, ele)...) est refusée. `coordinates`
+    n'est donc pas une liste : tester la présence de sommets avec
+    `len(polygon.coordinates)` (la valeur de vérité d'un tableau est
+    ambiguë) et ajouter des sommets avec `np.vstack`. Une valeur
+    réaffectée après construction n'est pas convertie : elle doit déjà
+    être un tableau (n, 2) de float64.
+    La classe utilise des slots : pas de `__dict__` par instance. Une
+    sous-classe doit déclarer ses propres `__slots__` (ou être elle aussi
+    une dataclass `slots=True`) pour conserver cet avantage.
+    Les propriétés `x` et `y` donnent accès aux longitudes et latitudes
+    sous forme de vues colonnes, sans copie.
+
     Attributes:
         osm_id: Identifiant unique OpenStreetMap
         polygon_type: Type de géométrie (way, relation, node)
-        coordinates: Liste de coordonnées [lon, lat]
+        coordinates: Tableau (n, 2) de coordonnées [lon, lat]
         tags: Dictionnaire des tags OSM
         properties: Propriétés additionnelles
 
@@ -37,10 +61,38 @@ class Polygon:
 
     osm_id: int
     polygon_type: PolygonType
-    coordinates: list = field(default_factory=list)
+    coordinates: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 2), dtype=np.float64)
+    )
     tags: dict = field(default_factory=dict)
     properties: dict = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        """
+        Convertit les coordonnées en tableau (n, 2) contigu de float64.
+
+        Raises:
+            ValueError: Si les coordonnées ne sont pas des paires [lon, lat]
+        """
+        coords = np.ascontiguousarray(self.coordinates, dtype=np.float64)
+        if coords.size == 0:
+            coords = coords.reshape(0, 2)
+        elif coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError(
+                f"Coordonnées de forme (n, 2) attendues, reçu {coords.shape}"
+            )
+        self.coordinates = coords
+
+    @property
+    def x(self) -> np.ndarray:
+        """Longitudes des sommets (vue sur la colonne 0, sans copie)."""
+        return self.coordinates[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """Latitudes des sommets (vue sur la colonne 1, sans copie)."""
+        return self.coordinates[:, 1]
+
     def is_closed(self) -> bool:
         """
         Vérifie si le polygone est fermé.
@@ -50,52 +102,56 @@ class Polygon:
         """
         if len(self.coordinates) < 3:
             return False
-        return self.coordinates[0] == self.coordinates[-1]
+        return bool((self.coordinates[0] == self.coordinates[-1]).all())
 
     def close(self) -> None:
         """Ferme le polygone si nécessaire."""
-        if not self.is_closed():
-            self.coordinates.append(self.coordinates[0])
+        c = self.coordinates
+        if not len(c) or (len(c) >= 3 and (c[0] == c[-1]).all()):
+            return
+        self.coordinates = np.concatenate((c, c[:1]))
 
     def is_valid(self) -> bool:
         """
         Valide la structure du polygone.
 
+        Un polygone valide a au moins trois points et est fermé.
+
         Returns:
             True si le polygone est valide.
         """
-        if len(self.coordinates) < 3:
-            return False
-        return self.is_closed()
+        c = self.coordinates
+        return len(c) >= 3 and bool((c[0] == c[-1]).all())
 
     def get_area(self) -> float:
         """
         Calcule approximativement l'aire du polygone (formule de Shoelace).
 
+        Le calcul porte directement sur le tableau des coordonnées et passe
+        par le noyau compilé par Numba lorsqu'il est disponible.
+
         Returns:
             Aire approximative en degrés carrés.
         """
-        if not self.is_closed() or len(self.coordinates) < 3:
+        if not self.is_closed():
             return 0.0
 
-        area = 0.0
-        for i in range(len(self.coordinates) - 1):
-            x1, y1 = self.coordinates[i]
-            x2, y2 = self.coordinates[i + 1]
-            area += (x1 * y2) - (x2 * y1)
-
-        return abs(area) / 2.0
+        return shoelace(self.coordinates)
 
-    def to_geojson_feature(self) -> dict[str, Any]:
+    def to_geojson_feature(self, as_array: bool = False) -> dict[str, Any]:
         """
         Convertit le polygone en feature GeoJSON.
 
+        Args:
+            as_array: Laisser les coordonnées en tableau NumPy, pour un
+                sérialiseur qui les prend en charge (orjson)
+
         Returns:
-            Feature GeoJSON.
+            Feature GeoJSON
         """
         properties = {
             "osm_id": self.osm_id,
-            "type": self.polygon_type.value,
+            "type": self.polygon_type,
             **self.tags,
             **self.properties,
         }
@@ -104,11 +160,25 @@ class Polygon:
             "type": "Feature",
             "geometry": {
                 "type": "Polygon",
-                "coordinates": [self.coordinates],
+                "coordinates": [
+                    self.coordinates if as_array else self.coordinates.tolist()
+                ],
             },
             "properties": properties,
         }
 
+    def __eq__(self, other: object) -> bool:
+        """Compare deux polygones champ par champ."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.osm_id == other.osm_id
+            and self.polygon_type == other.polygon_type
+            and np.array_equal(self.coordinates, other.coordinates)
+            and self.tags == other.tags
+            and self.properties == other.properties
+        )
+
     def __repr__(self) -> str:
         """Représentation string du polygone."""
         return (
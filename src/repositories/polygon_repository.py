@@ -1,12 +1,58 @@
 """Repository pour les polygones."""
 
+import hashlib
+import logging
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from itertools import chain
 from typing import Any
 
+import numpy as np
+
 from ..clients.overpass_client import OverpassClient
+from ..config import DEFAULT_CONFIG
 from ..models.bounding_box import BoundingBox
 from ..models.polygon import Polygon, PolygonType
 from .base import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# Gabarits des requêtes Overpass QL
+_WAY_QL = """
+[bbox:{bbox}];
+(
+  way{tags};
+);
+out geom;
+"""
+
+_UNION_QL = """
+[bbox:{bbox}];
+(
+{statements});
+out geom;
+"""
+
+_RELATION_QL = """
+[bbox:{bbox}];
+(
+  relation{tags};
+);
+out count;
+"""
+
+# Paire (lon, lat) : permet à np.fromiter de produire un tableau (n, 2)
+_COORD_DTYPE = np.dtype((np.float64, 2))
+
+# Cache disque : taille maximale et durée de validité des polygones et
+# des réponses. Les données OSM évoluent, une semaine est un compromis
+# raisonnable entre fraîcheur et économie du quota Overpass.
+DISK_CACHE_SIZE_LIMIT = 500 * 2**20
+DISK_CACHE_TTL = 7 * 24 * 3600
+
 
 class PolygonRepository(BaseRepository[Polygon]):
     """
@@ -15,19 +61,78 @@ class PolygonRepository(BaseRepository[Polygon]):
     Fournit des méthodes pour récupérer des polygones
     via l'API Overpass.
 
+    Le cache est un LRU borné : au-delà de `cache_size` polygones,
+    les moins récemment utilisés sont évincés.
+
+    Les tags OSM étant très répétitifs, leurs clés et valeurs sont
+    internées : les chaînes identiques ne sont stockées qu'une fois.
+    Chaque polygone garde son propre dictionnaire de tags, modifiable
+    sans effet sur les autres.
+
+    Avec `cache_dir`, le cache est persistant (diskcache, SQLite) et
+    survit entre les exécutions : les polygones y sont sérialisés par
+    pickle, expirent après `DISK_CACHE_TTL` secondes et sont évincés
+    au-delà de `DISK_CACHE_SIZE_LIMIT` octets. Les réponses Overpass y
+    sont aussi conservées, indexées par l'empreinte SHA-256 de la requête
+    normalisée : une requête déjà exécutée lors d'une exécution
+    précédente ne refait pas d'aller-retour réseau. Le repository se
+    ferme avec `close()` ou s'utilise comme gestionnaire de contexte :
+
+        >>> with PolygonRepository(client, cache_dir="cache") as repo:
+        ...     polygons = repo.find_ways(bbox)
+
     Attributes:
         client: Client Overpass pour les requêtes API
+        cache_size: Nombre maximal de polygones gardés en cache mémoire
     """
 
-    def __init__(self, client: OverpassClient):
+    def __init__(
+        self,
+        client: OverpassClient,
+        cache_size: int | None = None,
+        cache_dir: str | None = None,
+    ):
         """
         Initialise le repository.
 
         Args:
             client: Client Overpass
+            cache_size: Taille maximale du cache mémoire, 0 pour le
+                désactiver (défaut: `config.cache_size` du client)
+            cache_dir: Répertoire du cache persistant (défaut: cache en mémoire)
+
+        Raises:
+            ValueError: Si `cache_size` et `cache_dir` sont fournis ensemble
+                (le cache disque est borné en octets, pas en polygones)
+            ImportError: Si `cache_dir` est fourni sans diskcache installé
         """
+        if cache_size is not None and cache_dir is not None:
+            raise ValueError(
+                "cache_size ne s'applique pas au cache disque, "
+                f"borné à {DISK_CACHE_SIZE_LIMIT} octets"
+            )
+
         self.client = client
-        self._cache: dict[int, Polygon] = {}
+        if cache_size is None:
+            cache_size = getattr(client, "config", DEFAULT_CONFIG).cache_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, Polygon] | Any
+        self._responses: Any = None
+        if cache_dir is None:
+            self._cache = OrderedDict()
+        else:
+            import diskcache
+
+            self._cache = diskcache.Cache(
+                cache_dir,
+                size_limit=DISK_CACHE_SIZE_LIMIT,
+                eviction_policy="least-recently-used",
+            )
+            self._responses = diskcache.Cache(
+                os.path.join(cache_dir, "responses"),
+                size_limit=DISK_CACHE_SIZE_LIMIT,
+                eviction_policy="least-recently-used",
+            )
 
     def find_all(self) -> list[Polygon]:
         """
@@ -50,19 +155,31 @@ class PolygonRepository(BaseRepository[Polygon]):
         Returns:
             Le polygone ou None s'il n'existe pas
         """
-        return self._cache.get(item_id)
+        polygon = self._cache.get(item_id)
+        if polygon is not None and isinstance(self._cache, OrderedDict):
+            self._cache.move_to_end(item_id)
+        return polygon
 
     def save(self, item: Polygon) -> Polygon:
         """
         Sauvegarde un polygone en cache.
 
+        Évince le polygone le moins récemment utilisé si le cache est plein.
+
         Args:
             item: Polygone à sauvegarder
 
         Returns:
             Le polygone sauvegardé
         """
+        if not isinstance(self._cache, OrderedDict):
+            self._cache.set(item.osm_id, item, expire=DISK_CACHE_TTL)
+            return item
+
+        self._cache.pop(item.osm_id, None)
         self._cache[item.osm_id] = item
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
         return item
 
     def delete(self, item_id: int) -> bool:
@@ -83,7 +200,10 @@ class PolygonRepository(BaseRepository[Polygon]):
     # ==================== MÉTHODES SPÉCIFIQUES ====================
 
     def find_ways(
-        self, bbox: BoundingBox, tags: dict[str, str] | None = None
+        self,
+        bbox: BoundingBox,
+        tags: dict[str, str] | None = None,
+        stream: bool = False,
     ) -> list[Polygon]:
         """
         Récupère les polygones de type 'way' dans une bbox.
@@ -91,6 +211,7 @@ class PolygonRepository(BaseRepository[Polygon]):
         Args:
             bbox: Bounding box de recherche
             tags: Filtres de tags OSM
+            stream: Lire et parser la réponse en flux (grosses réponses)
 
         Returns:
             Liste des polygones trouvés
@@ -98,20 +219,9 @@ class PolygonRepository(BaseRepository[Polygon]):
         Raises:
             ValueError: Si la bbox est invalide
         """
-        if not bbox.is_valid():
-            raise ValueError(f"BoundingBox invalide: {bbox}")
-
-        if tags is None:
-            tags = {"building": "yes"}
-
-        tag_conditions = self._build_tag_conditions(tags)
-        query = f"""
-[bbox:{bbox.to_overpass()}];
-(
-  way{tag_conditions};
-);
-out geom;
-"""
+        query = self.build_ways_query(bbox, tags)
+        if stream:
+            return self._query_and_parse_stream(query, PolygonType.WAY)
         return self._query_and_parse(query, PolygonType.WAY)
 
     def find_relations(
@@ -133,14 +243,9 @@ out geom;
         if tags is None:
             tags = {"boundary": "administrative"}
 
-        tag_conditions = self._build_tag_conditions(tags)
-        query = f"""
-[bbox:{bbox.to_overpass()}];
-(
-  relation{tag_conditions};
-);
-out count;
-"""
+        query = _RELATION_QL.format(
+            bbox=bbox.to_overpass(), tags=self._build_tag_conditions(tags)
+        )
         data = self.client.query(query)
         return []  # Les relations nécessitent un traitement spécial
 
@@ -159,6 +264,118 @@ out count;
         """
         return self.find_ways(bbox, tags)
 
+    def find_ways_many(
+        self, bboxes: list[BoundingBox], tags: dict[str, str] | None = None
+    ) -> list[Polygon]:
+        """
+        Récupère les 'way' de plusieurs bbox avec des requêtes parallèles.
+
+        Un polygone à cheval sur plusieurs bbox n'est renvoyé qu'une fois.
+
+        Args:
+            bboxes: Bounding boxes de recherche (par exemple des tuiles)
+            tags: Filtres de tags OSM
+
+        Returns:
+            Liste des polygones trouvés (sans doublon)
+
+        Raises:
+            ValueError: Si une bbox est invalide
+        """
+        queries = [self.build_ways_query(bbox, tags) for bbox in bboxes]
+        polygons: dict[int, Polygon] = {}
+        for data in self.client.map_queries(queries):
+            for polygon in self.parse_response(data, PolygonType.WAY):
+                polygons.setdefault(polygon.osm_id, polygon)
+        return list(polygons.values())
+
+    def find_ways_union(
+        self, bbox: BoundingBox, tag_sets: list[dict[str, str]]
+    ) -> list[Polygon]:
+        """
+        Récupère en une seule requête les 'way' correspondant à plusieurs filtres.
+
+        Args:
+            bbox: Bounding box de recherche
+            tag_sets: Filtres de tags OSM, combinés par union
+
+        Returns:
+            Liste des polygones trouvés (sans doublon)
+
+        Raises:
+            ValueError: Si la bbox est invalide
+        """
+        query = self.build_union_query(bbox, tag_sets)
+        return self._query_and_parse(query, PolygonType.WAY)
+
+    def build_ways_query(
+        self, bbox: BoundingBox, tags: dict[str, str] | None = None
+    ) -> str:
+        """
+        Construit la requête Overpass QL des 'way' d'une bbox.
+
+        Args:
+            bbox: Bounding box de recherche
+            tags: Filtres de tags OSM (défaut: bâtiments)
+
+        Returns:
+            Requête Overpass QL
+
+        Raises:
+            ValueError: Si la bbox est invalide
+        """
+        if not bbox.is_valid():
+            raise ValueError(f"BoundingBox invalide: {bbox}")
+
+        if tags is None:
+            tags = {"building": "yes"}
+
+        return _WAY_QL.format(
+            bbox=bbox.to_overpass(), tags=self._build_tag_conditions(tags)
+        )
+
+    def build_union_query(
+        self, bbox: BoundingBox, tag_sets: list[dict[str, str]]
+    ) -> str:
+        """
+        Construit une requête Overpass QL unissant plusieurs filtres de 'way'.
+
+        Args:
+            bbox: Bounding box de recherche
+            tag_sets: Filtres de tags OSM
+
+        Returns:
+            Requête Overpass QL
+
+        Raises:
+            ValueError: Si la bbox est invalide
+        """
+        if not bbox.is_valid():
+            raise ValueError(f"BoundingBox invalide: {bbox}")
+
+        statements = "".join(
+            f"  way{self._build_tag_conditions(tags)};\n" for tags in tag_sets
+        )
+        return _UNION_QL.format(bbox=bbox.to_overpass(), statements=statements)
+
+    def parse_response(
+        self, data: dict[str, Any], polygon_type: PolygonType
+    ) -> list[Polygon]:
+        """
+        Parse une réponse Overpass et met les polygones en cache.
+
+        Args:
+            data: Réponse JSON de l'API Overpass
+            polygon_type: Type de polygone attendu
+
+        Returns:
+            Liste des polygones parsés
+        """
+        if not data or not isinstance(data.get("elements"), list):
+            return []
+
+        return self._parse_elements(data["elements"], polygon_type)
+
     # ==================== MÉTHODES PRIVÉES ====================
 
     def _query_and_parse(
@@ -175,25 +392,87 @@ out count;
             Liste des polygones parsés
         """
         try:
+            data = self._fetch(query)
+            return self.parse_response(data, polygon_type)
+
+        except Exception as e:
+            logger.warning("Erreur lors du parsing : %s", e)
+            return []
+
+    def _fetch(self, query: str) -> dict[str, Any]:
+        """
+        Exécute une requête, en passant par le cache disque des réponses.
+
+        Args:
+            query: Requête Overpass QL
+
+        Returns:
+            Réponse JSON de l'API Overpass
+        """
+        if self._responses is None:
+            return self.client.query(query)
+
+        key = hashlib.sha256(" ".join(query.split()).encode()).hexdigest()
+        data = self._responses.get(key)
+        if data is None:
             data = self.client.query(query)
+            self._responses.set(key, data, expire=DISK_CACHE_TTL)
+        return data
 
-            if not data or "elements" not in data:
-                return []
+    def _query_and_parse_stream(
+        self, query: str, polygon_type: PolygonType
+    ) -> list[Polygon]:
+        """
+        Exécute une requête en flux et parse chaque élément à sa réception.
 
-            polygons = []
-            for element in data["elements"]:
-                if element.get("type") == polygon_type.value:
-                    polygon = self._parse_element(element, polygon_type)
-                    if polygon:
-                        self.save(polygon)
-                        polygons.append(polygon)
+        Args:
+            query: Requête Overpass QL
+            polygon_type: Type de polygone attendu
 
-            return polygons
+        Returns:
+            Liste des polygones parsés
+        """
+        try:
+            return self._parse_elements(
+                self.client.query_stream(query), polygon_type
+            )
 
         except Exception as e:
-            print(f"Erreur lors du parsing : {e}")
+            logger.warning("Erreur lors du parsing : %s", e)
             return []
 
+    def _parse_elements(
+        self, elements: Iterable[dict[str, Any]], polygon_type: PolygonType
+    ) -> list[Polygon]:
+        """
+        Parse des éléments Overpass et met les polygones en cache.
+
+        Un élément mal formé est journalisé et ignoré sans interrompre
+        le parsing des suivants.
+
+        Args:
+            elements: Éléments Overpass (liste ou flux)
+            polygon_type: Type de polygone attendu
+
+        Returns:
+            Liste des polygones parsés
+        """
+        polygons = []
+        for element in elements:
+            if element.get("type") == polygon_type:
+                try:
+                    polygon = self._parse_element(element, polygon_type)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(
+                        "Élément %s ignoré : %s", element.get("id"), e
+                    )
+                    continue
+                if polygon:
+                    self.save(polygon)
+                    polygons.append(polygon)
+
+        return polygons
+
     def _parse_element(
         self, element: dict[str, Any], polygon_type: PolygonType
     ) -> Polygon | None:
@@ -205,57 +484,81 @@ out count;
             polygon_type: Type de polygone
 
         Returns:
-            Objet Polygon ou None si parsing échoue
+            Objet Polygon ou None si l'élément n'a pas de géométrie
+
+        Raises:
+            KeyError: Si un nœud n'a pas de coordonnées
+            TypeError: Si la géométrie est mal formée
+            ValueError: Si une coordonnée n'est pas numérique
         """
-        try:
-            osm_id = element.get("id")
-            tags = element.get("tags", {})
-
-            # Extraire les coordonnées
-            coordinates = []
-            if "geometry" in element:
-                for node in element["geometry"]:
-                    coordinates.append([node["lon"], node["lat"]])
-
-            if not coordinates:
-                return None
-
-            polygon = Polygon(
-                osm_id=osm_id,
-                polygon_type=polygon_type,
-                coordinates=coordinates,
-                tags=tags,
-            )
+        osm_id = element.get("id")
 
-            # Fermer le polygone si nécessaire
-            if polygon_type == PolygonType.WAY:
-                polygon.close()
+        # Extraire les coordonnées
+        geometry = element.get("geometry")
+        if not geometry:
+            return None
 
-            return polygon
+        # Fermer le polygone si nécessaire, sans passer par close()
+        count = len(geometry)
+        closing = 0
+        if polygon_type == PolygonType.WAY:
+            first, last = geometry[0], geometry[-1]
+            if (
+                count < 3
+                or first["lon"] != last["lon"]
+                or first["lat"] != last["lat"]
+            ):
+                closing = 1
+
+        # Un seul tableau (n, 2), alloué d'emblée à sa taille finale
+        nodes = chain(geometry, geometry[:closing])
+        coordinates = np.fromiter(
+            ((node["lon"], node["lat"]) for node in nodes),
+            dtype=_COORD_DTYPE,
+            count=count + closing,
+        )
 
-        except Exception as e:
-            print(f"Erreur lors du parsing de l'élément {element.get('id')}: {e}")
-            return None
+        return Polygon(
+            osm_id=osm_id,
+            polygon_type=polygon_type,
+            coordinates=coordinates,
+            tags=self._intern_tags(element.get("tags") or {}),
+        )
+
+    @staticmethod
+    def _intern_tags(tags: dict[str, str]) -> dict[str, str]:
+        """
+        Copie des tags dont les clés et valeurs sont internées.
+
+        Args:
+            tags: Tags bruts d'un élément Overpass
+
+        Returns:
+            Nouveau dictionnaire de tags (`sys.intern` sur chaque chaîne)
+        """
+        return {sys.intern(k): sys.intern(v) for k, v in tags.items()}
 
     @staticmethod
     def _build_tag_conditions(tags: dict[str, str]) -> str:
         """
         Construit les conditions de tag pour Overpass QL.
 
+        Le résultat est mémorisé par ensemble de tags (indépendamment
+        de l'ordre des clés).
+
         Args:
             tags: Dictionnaire {key: value}
 
         Returns:
             String formaté pour Overpass QL
         """
-        conditions = ""
-        for key, value in tags.items():
-            conditions += f'["{key}"="{value}"]'
-        return conditions
+        return _tag_conditions(tuple(sorted(tags.items())))
 
     def clear_cache(self) -> None:
-        """Vide le cache."""
+        """Vide le cache (polygones et réponses du cache disque)."""
         self._cache.clear()
+        if self._responses is not None:
+            self._responses.clear()
 
     def get_cache_size(self) -> int:
         """
@@ -264,4 +567,47 @@ out count;
         Returns:
             Nombre de polygones en cache
         """
-        return len(self._cache)
\ No newline at end of file
+        return len(self._cache)
+
+    def close(self) -> None:
+        """Ferme le cache disque (sans effet sur le cache mémoire)."""
+        if self._responses is not None:
+            self._cache.close()
+            self._responses.close()
+
+    def __enter__(self) -> "PolygonRepository":
+        """Entre dans le gestionnaire de contexte."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Ferme le cache à la sortie du gestionnaire de contexte."""
+        self.close()
+
+
+@lru_cache(maxsize=256)
+def _tag_conditions(items: tuple[tuple[str, str], ...]) -> str:
+    """
+    Construit et mémorise les conditions de tag Overpass QL.
+
+    Args:
+        items: Paires (clé, valeur) triées
+
+    Returns:
+        String formaté pour Overpass QL
+    """
+    return "".join(f'["{_escape(key)}"="{_escape(value)}"]' for key, value in items)
+
+
+def _escape(text: str) -> str:
+    """
+    Échappe une chaîne pour un littéral Overpass QL entre guillemets.
+
+    Args:
+        text: Clé ou valeur de tag
+
+    Returns:
+        Chaîne échappée
+    """
+    if "\\" not in text and '"' not in text:
+        return text
+    return text.replace("\\", "\\\\").replace('"', '\\"')
@@ -1,9 +1,15 @@
 """Service pour la gestion des polygones."""
 
+import asyncio
+from collections.abc import Iterable, Sequence
 from typing import Any
 
+import numpy as np
+import orjson
+
+from ..clients.overpass_client import AsyncOverpassClient
 from ..models.bounding_box import BoundingBox
-from ..models.polygon import Polygon
+from ..models.polygon import Polygon, PolygonType
 from ..repositories.polygon_repository import PolygonRepository
 
 
@@ -94,10 +100,95 @@ class PolygonService:
         """
         return self.repository.find_by_tags(bbox, tags)
 
+    def find_ways_tiled(
+        self,
+        bbox: BoundingBox,
+        tiles_x: int,
+        tiles_y: int,
+        tags: dict[str, str] | None = None,
+    ) -> list[Polygon]:
+        """
+        Récupère les polygones d'une grande zone découpée en tuiles.
+
+        Chaque tuile fait l'objet d'une requête, exécutées en parallèle
+        (voir `OverpassClient.map_queries` pour le nombre de requêtes
+        simultanées) ;
+        les polygones présents sur plusieurs tuiles sont dédoublonnés.
+
+        Args:
+            bbox: Zone de recherche
+            tiles_x: Nombre de tuiles en longitude
+            tiles_y: Nombre de tuiles en latitude
+            tags: Filtres de tags OSM (défaut: bâtiments)
+
+        Returns:
+            Liste des polygones trouvés
+        """
+        return self.repository.find_ways_many(bbox.split(tiles_x, tiles_y), tags)
+
+    def get_multi_layers(
+        self, bbox: BoundingBox, layers: dict[str, dict[str, str]]
+    ) -> dict[str, list[Polygon]]:
+        """
+        Récupère plusieurs couches de polygones en une seule requête.
+
+        Les filtres sont combinés dans une union Overpass (un seul
+        aller-retour réseau), puis chaque polygone est rangé dans les
+        couches dont il porte tous les tags.
+
+        Args:
+            bbox: Zone de recherche
+            layers: Filtres de tags OSM par nom de couche
+
+        Returns:
+            Polygones trouvés par nom de couche
+        """
+        result: dict[str, list[Polygon]] = {name: [] for name in layers}
+        if not layers:
+            return result
+
+        polygons = self.repository.find_ways_union(bbox, list(layers.values()))
+        for polygon in polygons:
+            for name, tags in layers.items():
+                if all(polygon.tags.get(k) == v for k, v in tags.items()):
+                    result[name].append(polygon)
+
+        return result
+
+    async def get_layers_async(
+        self,
+        bbox: BoundingBox,
+        layers: list[dict[str, str]],
+        client: AsyncOverpassClient,
+    ) -> list[list[Polygon]]:
+        """
+        Récupère plusieurs couches de polygones en parallèle.
+
+        Une requête est construite par couche puis toutes sont envoyées
+        simultanément ; le parsing reste synchrone.
+
+        Args:
+            bbox: Zone de recherche
+            layers: Filtres de tags OSM, un dictionnaire par couche
+            client: Client Overpass asynchrone
+
+        Returns:
+            Liste des polygones trouvés pour chaque couche, dans l'ordre
+        """
+        queries = [self.repository.build_ways_query(bbox, tags) for tags in layers]
+        responses = await asyncio.gather(*(client.query(q) for q in queries))
+        return [
+            self.repository.parse_response(data, PolygonType.WAY)
+            for data in responses
+        ]
+
     # ==================== OPERATIONS ====================
 
     def filter_by_area(
-        self, polygons: list[Polygon], min_area: float, max_area: float | None = None
+        self,
+        polygons: Iterable[Polygon],
+        min_area: float,
+        max_area: float | None = None,
     ) -> list[Polygon]:
         """
         Filtre les polygones par aire.
@@ -110,15 +201,20 @@ class PolygonService:
         Returns:
             Polygones filtrés
         """
-        filtered = [p for p in polygons if p.get_area() >= min_area]
+        polygons = list(polygons)
+        if not polygons:
+            return []
+
+        areas = _batch_areas(polygons)
+        mask = areas >= min_area
 
         if max_area is not None:
-            filtered = [p for p in filtered if p.get_area() <= max_area]
+            mask &= areas <= max_area
 
-        return filtered
+        return [p for p, keep in zip(polygons, mask) if keep]
 
     def filter_by_tag_value(
-        self, polygons: list[Polygon], tag_key: str, tag_value: str
+        self, polygons: Iterable[Polygon], tag_key: str, tag_value: str
     ) -> list[Polygon]:
         """
         Filtre les polygones par valeur de tag.
@@ -135,7 +231,7 @@ class PolygonService:
             p for p in polygons if p.tags.get(tag_key) == tag_value
         ]
 
-    def convert_to_geojson(self, polygons: list[Polygon]) -> dict[str, Any]:
+    def convert_to_geojson(self, polygons: Iterable[Polygon]) -> dict[str, Any]:
         """
         Convertit les polygones en FeatureCollection GeoJSON.
 
@@ -152,7 +248,29 @@ class PolygonService:
             "features": features,
         }
 
-    def get_statistics(self, polygons: list[Polygon]) -> dict[str, Any]:
+    def to_geojson_bytes(self, polygons: Iterable[Polygon]) -> bytes:
+        """
+        Sérialise les polygones en FeatureCollection GeoJSON (JSON encodé).
+
+        Les tableaux de coordonnées sont écrits directement par orjson,
+        sans conversion intermédiaire en listes Python : à privilégier
+        pour écrire sur disque ou envoyer sur le réseau.
+
+        Args:
+            polygons: Liste de polygones
+
+        Returns:
+            FeatureCollection GeoJSON encodée en UTF-8
+        """
+        collection = {
+            "type": "FeatureCollection",
+            "features": [p.to_geojson_feature(as_array=True) for p in polygons],
+        }
+        return orjson.dumps(
+            collection, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    def get_statistics(self, polygons: Iterable[Polygon]) -> dict[str, Any]:
         """
         Calcule des statistiques sur les polygones.
 
@@ -162,6 +280,7 @@ class PolygonService:
         Returns:
             Dictionnaire de statistiques
         """
+        polygons = list(polygons)
         if not polygons:
             return {
                 "count": 0,
@@ -171,13 +290,48 @@ class PolygonService:
                 "total_area": 0.0,
             }
 
-        areas = [p.get_area() for p in polygons]
-        total_area = sum(areas)
+        areas = _batch_areas(polygons)
+        total_area = float(np.sum(areas))
 
         return {
             "count": len(polygons),
             "avg_area": total_area / len(polygons),
-            "min_area": min(areas),
-            "max_area": max(areas),
+            "min_area": float(np.min(areas)),
+            "max_area": float(np.max(areas)),
             "total_area": total_area,
-        }
\ No newline at end of file
+        }
+
+
+def _batch_areas(polygons: Sequence[Polygon]) -> np.ndarray:
+    """
+    Calcule l'aire de plusieurs polygones en une seule passe NumPy.
+
+    Les anneaux sont concaténés dans un unique tableau de points, indexé
+    par un tableau d'offsets (format CSR), puis les produits croisés de la
+    formule de Shoelace sont sommés par anneau avec `np.add.reduceat`.
+    Comme `Polygon.get_area`, un polygone non fermé a une aire nulle.
+
+    Args:
+        polygons: Liste de polygones
+
+    Returns:
+        Tableau des aires, dans l'ordre des polygones
+    """
+    areas = np.zeros(len(polygons), dtype=np.float64)
+    indices = [i for i, p in enumerate(polygons) if p.is_closed()]
+    if not indices:
+        return areas
+
+    rings = [polygons[i].coordinates for i in indices]
+    points = np.concatenate(rings)
+    offsets = np.cumsum([0] + [len(ring) for ring in rings])
+
+    x = points[:, 0]
+    y = points[:, 1]
+    cross = x * np.roll(y, -1) - np.roll(x, -1) * y
+    # Le dernier sommet de chaque anneau ne doit pas être relié au
+    # premier sommet de l'anneau suivant
+    cross[offsets[1:] - 1] = 0.0
+
+    areas[indices] = 0.5 * np.abs(np.add.reduceat(cross, offsets[:-1]))
+    return areas
\ No newline at end of file
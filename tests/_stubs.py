@@ -0,0 +1,21 @@
+"""Lightweight test doubles shared through tests/conftest.py."""
+
+
+class StubRepo:
+    """Repository stub for tests that never inspect repository calls.
+
+    Every query returns an empty list; use mock_repo when a test needs
+    to configure return values or assert on calls.
+    """
+
+    def find_ways(self, *args, **kwargs):
+        return []
+
+    def find_ways_union(self, *args, **kwargs):
+        return []
+
+    def find_ways_many(self, *args, **kwargs):
+        return []
+
+    def find_by_tags(self, *args, **kwargs):
+        return []
@@ -1,29 +1,34 @@
 """Shared fixtures for all tests."""
 
 import pytest
+from unittest.mock import create_autospec
 from src.models.bounding_box import BoundingBox
 from src.models.polygon import Polygon, PolygonType
 from src.config import OverpassConfig
 from src.clients.overpass_client import OverpassClient
+from src.repositories.polygon_repository import PolygonRepository
+from src.services.polygon_service import PolygonService
+from tests._stubs import StubRepo
 
 
 # ============================================================================
 # BOUNDING BOX FIXTURES
 # ============================================================================
+# BoundingBox is frozen: bbox fixtures are built once per session.
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_bbox():
     """Create a valid bounding box."""
     return BoundingBox(lat_min=40.7128, lon_min=-74.0060, lat_max=40.7580, lon_max=-73.9855)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def paris_bbox():
     """Create a bounding box around Paris."""
     return BoundingBox(lat_min=48.8155, lon_min=2.2242, lat_max=48.8566, lon_max=2.3522)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_bbox_reversed():
     """Create an invalid bounding box with reversed coordinates."""
     return BoundingBox(lat_min=50.0, lon_min=10.0, lat_max=40.0, lon_max=5.0)
@@ -111,14 +116,15 @@ def park_polygon():
 # ============================================================================
 # CONFIGURATION FIXTURES
 # ============================================================================
+# Configurations are read-only in tests: built once per session.
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def default_config():
     """Create default OverpassConfig."""
     return OverpassConfig()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def custom_config():
     """Create custom OverpassConfig."""
     return OverpassConfig(
@@ -145,6 +151,43 @@ def custom_client(custom_config):
     return OverpassClient(config=custom_config)
 
 
+# ============================================================================
+# MOCK FIXTURES
+# ============================================================================
+
+# Autospecs are built once (introspection is the costly part) and reset
+# before each test. spec_set=True: tests may only configure attributes
+# that exist on the real class.
+_CLIENT_AUTOSPEC = create_autospec(OverpassClient, instance=True, spec_set=True)
+_REPO_AUTOSPEC = create_autospec(PolygonRepository, instance=True, spec_set=True)
+
+
+@pytest.fixture
+def mock_overpass_client():
+    """Return the shared OverpassClient autospec, reset for this test."""
+    _CLIENT_AUTOSPEC.reset_mock(return_value=True, side_effect=True)
+    return _CLIENT_AUTOSPEC
+
+
+@pytest.fixture
+def repo(mock_overpass_client):
+    """Create a PolygonRepository backed by the mock client."""
+    return PolygonRepository(mock_overpass_client)
+
+
+@pytest.fixture
+def mock_repo():
+    """Return the shared PolygonRepository autospec, reset for this test."""
+    _REPO_AUTOSPEC.reset_mock(return_value=True, side_effect=True)
+    return _REPO_AUTOSPEC
+
+
+@pytest.fixture
+def service():
+    """Create a PolygonService over a stub repository (no call tracking)."""
+    return PolygonService(StubRepo())
+
+
 # ============================================================================
 # MOCK DATA FIXTURES
 # ============================================================================
@@ -182,10 +225,11 @@ def mock_empty_response():
     }
 
 
-@pytest.fixture
+# Read-only in every test using it: built once per session.
+@pytest.fixture(scope="session")
 def polygon_list():
-    """Create a list of test polygons."""
-    return [
+    """Create a tuple of test polygons."""
+    return (
         Polygon(
             osm_id=1,
             polygon_type=PolygonType.WAY,
@@ -207,4 +251,18 @@ def polygon_list():
             tags={"building": "yes"},
             properties={"area": 4.0},
         ),
-    ]
\ No newline at end of file
+    )
+
+
+@pytest.fixture
+def polygons(request):
+    """Resolve the polygon fixture named by an indirect parameter as a tuple.
+
+    A Polygon fixture is wrapped in a one-element tuple; no parameter
+    gives an empty tuple.
+    """
+    name = getattr(request, "param", None)
+    if name is None:
+        return ()
+    value = request.getfixturevalue(name)
+    return (value,) if isinstance(value, Polygon) else tuple(value)
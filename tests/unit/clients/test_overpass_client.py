@@ -1,12 +1,37 @@
 """Tests for OverpassClient."""
 
+import asyncio
+import httpx
+import orjson
 import pytest
 import requests
-from unittest.mock import Mock, patch, MagicMock
-from src.clients.overpass_client import OverpassClient
+import threading
+from io import BytesIO
+from itertools import islice
+from unittest.mock import AsyncMock, Mock, patch
+from urllib3.exceptions import ConnectTimeoutError, InvalidHeader, NewConnectionError
+from urllib3.response import HTTPResponse
+from src.clients.overpass_client import AsyncOverpassClient, OverpassClient
 from src.config import OverpassConfig
 
 
+def _raw_response(status, body=b"{}"):
+    """Build a raw urllib3 response as returned by the connection pool."""
+    return HTTPResponse(
+        body=BytesIO(body),
+        status=status,
+        headers={"Content-Type": "application/json"},
+        preload_content=False,
+    )
+
+
+def _httpx_response(status, json=None):
+    """Build an httpx response bound to a request, as returned by the client."""
+    return httpx.Response(
+        status, json=json, request=httpx.Request("GET", "https://example.test")
+    )
+
+
 class TestOverpassClientInit:
     """Test OverpassClient initialization."""
 
@@ -29,14 +54,60 @@ class TestOverpassClientInit:
         assert client.config.url == "https://overpass-api.de/api/interpreter"
 
 
+class TestOverpassClientSession:
+    """Test OverpassClient persistent HTTP session."""
+
+    def test_session_is_reused_between_calls(self):
+        """Test that the same session is used for every request."""
+        client = OverpassClient()
+        with patch.object(client._session, "get") as mock_get:
+            mock_get.return_value.content = orjson.dumps({})
+            client.query("[bbox:0,0,1,1];way;out;")
+            client.query("[bbox:0,0,2,2];way;out;")
+
+        assert mock_get.call_count == 2
+
+    def test_session_sets_user_agent(self):
+        """Test that a default User-Agent header is set on the session."""
+        client = OverpassClient()
+        assert client._session.headers["User-Agent"].startswith("OverPassAPI/")
+
+    def test_https_adapter_is_pooled(self):
+        """Test that an HTTPAdapter with a connection pool is mounted."""
+        client = OverpassClient()
+        adapter = client._session.get_adapter("https://overpass-api.de")
+        assert adapter._pool_maxsize == 16
+
+    def test_pool_size_comes_from_config(self):
+        """Test that the adapter pool is sized from the configuration."""
+        client = OverpassClient(OverpassConfig(pool_size=4))
+        adapter = client._session.get_adapter("https://overpass-api.de")
+        assert adapter._pool_maxsize == 4
+        assert adapter._pool_connections == 4
+
+    def test_close_closes_session(self):
+        """Test that close() closes the underlying session."""
+        client = OverpassClient()
+        with patch.object(client._session, "close") as mock_close:
+            client.close()
+        mock_close.assert_called_once()
+
+    def test_context_manager_closes_session(self):
+        """Test that the client closes its session when used as a context manager."""
+        with patch("src.clients.overpass_client.requests.Session.close") as mock_close:
+            with OverpassClient() as client:
+                assert isinstance(client, OverpassClient)
+        mock_close.assert_called_once()
+
+
 class TestOverpassClientQuery:
     """Test OverpassClient.query() method."""
 
-    @patch("src.clients.overpass_client.requests.get")
+    @patch("src.clients.overpass_client.requests.Session.get")
     def test_successful_query(self, mock_get):
         """Test successful query execution."""
         mock_response = Mock()
-        mock_response.json.return_value = {"elements": []}
+        mock_response.content = orjson.dumps({"elements": []})
         mock_response.status_code = 200
         mock_get.return_value = mock_response
 
@@ -46,11 +117,38 @@ class TestOverpassClientQuery:
         assert result == {"elements": []}
         mock_get.assert_called_once()
 
-    @patch("src.clients.overpass_client.requests.get")
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_decodes_raw_content(self, mock_get):
+        """Test that the raw body is decoded without response.json()."""
+        data = {"elements": [{"id": i, "lat": 48.8 + i / 1e4} for i in range(1000)]}
+        mock_response = Mock()
+        mock_response.content = orjson.dumps(data)
+        mock_response.json.side_effect = AssertionError("stdlib json used")
+        mock_get.return_value = mock_response
+
+        client = OverpassClient()
+
+        assert client.query("[bbox:0,0,1,1];way;out;") == data
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_rejects_non_json_body(self, mock_get, caplog):
+        """Test that an HTML error page raises a logged RequestException."""
+        mock_response = Mock()
+        mock_response.content = b"<html>runtime error</html>"
+        mock_get.return_value = mock_response
+
+        client = OverpassClient()
+
+        with pytest.raises(requests.exceptions.JSONDecodeError) as excinfo:
+            client.query("[bbox:0,0,1,1];way;out;")
+        assert isinstance(excinfo.value, requests.exceptions.RequestException)
+        assert [r.levelname for r in caplog.records] == ["WARNING"]
+
+    @patch("src.clients.overpass_client.requests.Session.get")
     def test_query_passes_correct_parameters(self, mock_get):
-        """Test that query passes correct parameters to requests.get."""
+        """Test that query passes correct parameters to the session."""
         mock_response = Mock()
-        mock_response.json.return_value = {}
+        mock_response.content = orjson.dumps({})
         mock_response.status_code = 200
         mock_get.return_value = mock_response
 
@@ -58,17 +156,17 @@ class TestOverpassClientQuery:
         query_str = "[bbox:0,0,1,1];way;out;"
         client.query(query_str)
 
-        # Check that requests.get was called with correct parameters
+        # Check that the session was called with correct parameters
         call_args = mock_get.call_args
         assert call_args[0][0] == "https://overpass-api.de/api/interpreter"
         assert call_args[1]["params"]["data"] == query_str
         assert "timeout" in call_args[1]
 
-    @patch("src.clients.overpass_client.requests.get")
+    @patch("src.clients.overpass_client.requests.Session.get")
     def test_query_uses_config_timeout(self, mock_get):
         """Test that query uses timeout from config."""
         mock_response = Mock()
-        mock_response.json.return_value = {}
+        mock_response.content = orjson.dumps({})
         mock_response.status_code = 200
         mock_get.return_value = mock_response
 
@@ -77,70 +175,32 @@ class TestOverpassClientQuery:
         client.query("[bbox:0,0,1,1];way;out;")
 
         call_args = mock_get.call_args
-        assert call_args[1]["timeout"] == 60
-
-    @patch("src.clients.overpass_client.time.sleep")
-    @patch("src.clients.overpass_client.requests.get")
-    def test_query_retry_on_failure(self, mock_get, mock_sleep):
-        """Test that query retries on failure."""
-        # First two attempts fail, third succeeds
-        mock_response_fail = Mock()
-        mock_response_fail.raise_for_status.side_effect = requests.exceptions.ConnectionError()
+        assert call_args[1]["timeout"] == (5.0, 60)
 
-        mock_response_success = Mock()
-        mock_response_success.json.return_value = {"elements": []}
-        mock_response_success.status_code = 200
-
-        mock_get.side_effect = [
-            mock_response_fail,
-            mock_response_fail,
-            mock_response_success,
-        ]
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_connect_timeout_never_exceeds_timeout(self, mock_get):
+        """Test that a short config timeout also bounds the connect phase."""
+        mock_get.return_value.content = orjson.dumps({})
 
-        config = OverpassConfig(max_retries=3, retry_delay=1.0)
-        client = OverpassClient(config=config)
+        client = OverpassClient(config=OverpassConfig(timeout=3))
+        client.query("[bbox:0,0,1,1];way;out;")
 
-        # This should succeed on third attempt
-        result = client.query("[bbox:0,0,1,1];way;out;")
-        assert result == {"elements": []}
-        assert mock_get.call_count == 3
+        assert mock_get.call_args[1]["timeout"] == (3, 3)
 
-    @patch("src.clients.overpass_client.time.sleep")
-    @patch("src.clients.overpass_client.requests.get")
-    def test_query_exponential_backoff(self, mock_get, mock_sleep):
-        """Test that retry delays increase exponentially."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.ConnectionError()
-        mock_get.return_value = mock_response
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_raises_on_connection_error(self, mock_get):
+        """Test that query surfaces errors once the adapter gave up."""
+        mock_get.side_effect = requests.exceptions.ConnectionError()
 
-        config = OverpassConfig(max_retries=3, retry_delay=1.0)
-        client = OverpassClient(config=config)
+        client = OverpassClient()
 
         with pytest.raises(requests.exceptions.ConnectionError):
             client.query("[bbox:0,0,1,1];way;out;")
 
-        # Should have slept with exponential backoff: 1.0, 2.0
-        assert mock_sleep.call_count == 2
-        calls = [call[0][0] for call in mock_sleep.call_args_list]
-        assert calls[0] == pytest.approx(1.0)  # 1.0 * (2 ** 0)
-        assert calls[1] == pytest.approx(2.0)  # 1.0 * (2 ** 1)
-
-    @patch("src.clients.overpass_client.requests.get")
-    def test_query_raises_after_max_retries(self, mock_get):
-        """Test that query raises exception after max retries."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.Timeout()
-        mock_get.return_value = mock_response
+        # Retries happen in the transport adapter, not in query()
+        assert mock_get.call_count == 1
 
-        config = OverpassConfig(max_retries=2, retry_delay=0.1)
-        client = OverpassClient(config=config)
-
-        with pytest.raises(requests.exceptions.Timeout):
-            client.query("[bbox:0,0,1,1];way;out;")
-
-        assert mock_get.call_count == 2
-
-    @patch("src.clients.overpass_client.requests.get")
+    @patch("src.clients.overpass_client.requests.Session.get")
     def test_query_handles_http_error(self, mock_get):
         """Test that query handles HTTP errors."""
         mock_response = Mock()
@@ -152,7 +212,7 @@ class TestOverpassClientQuery:
         with pytest.raises(requests.exceptions.HTTPError):
             client.query("[bbox:0,0,1,1];way;out;")
 
-    @patch("src.clients.overpass_client.requests.get")
+    @patch("src.clients.overpass_client.requests.Session.get")
     def test_query_returns_json(self, mock_get):
         """Test that query returns JSON response."""
         expected_data = {
@@ -162,7 +222,7 @@ class TestOverpassClientQuery:
             ],
         }
         mock_response = Mock()
-        mock_response.json.return_value = expected_data
+        mock_response.content = orjson.dumps(expected_data)
         mock_response.status_code = 200
         mock_get.return_value = mock_response
 
@@ -170,57 +230,813 @@ class TestOverpassClientQuery:
         result = client.query("[bbox:0,0,1,1];way;out;")
 
         assert result == expected_data
-        mock_response.json.assert_called_once()
+        mock_response.json.assert_not_called()
+
+
+class TestOverpassClientQueryCache:
+    """Test the query response cache."""
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_caches_result(self, mock_get):
+        """Test that a repeated query is served from the cache as a copy."""
+        mock_get.return_value.content = orjson.dumps({"elements": [{"id": 1}]})
+
+        client = OverpassClient()
+        first = client.query("[bbox:0,0,1,1];way;out;")
+        first["elements"][0]["id"] = 2
+        second = client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_get.call_count == 1
+        assert second == {"elements": [{"id": 1}]}
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_zero_cache_size_disables_cache(self, mock_get):
+        """Test that query_cache_size=0 sends every query."""
+        mock_get.return_value.content = orjson.dumps({})
+
+        client = OverpassClient(OverpassConfig(query_cache_size=0))
+        client.query("[bbox:0,0,1,1];way;out;")
+        client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_get.call_count == 2
+        assert len(client._qcache) == 0
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_identical_queries_hit_cache(self, mock_get):
+        """Test that identical queries (modulo whitespace) are fetched once."""
+        mock_get.return_value.content = orjson.dumps({"elements": [1]})
+
+        client = OverpassClient()
+        first = client.query("[bbox:0,0,1,1];\nway;\nout;")
+        second = client.query("[bbox:0,0,1,1]; way;  out;")
+
+        assert first == second == {"elements": [1]}
+        assert mock_get.call_count == 1
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_cache_returns_copies(self, mock_get):
+        """Test that mutating a result does not corrupt the cache."""
+        mock_get.return_value.content = orjson.dumps({"elements": []})
+
+        client = OverpassClient()
+        client.query("[bbox:0,0,1,1];way;out;")["elements"].append("x")
+
+        assert client.query("[bbox:0,0,1,1];way;out;") == {"elements": []}
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_cache_stores_raw_body(self, mock_get):
+        """Test that the cache keeps the response bytes, not the decoded dict."""
+        body = orjson.dumps({"elements": [{"id": 1}]})
+        mock_get.return_value.content = body
+
+        client = OverpassClient()
+        client.query("[bbox:0,0,1,1];way;out;")
+
+        ((_, cached),) = client._qcache.values()
+        assert cached is body
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_clear_query_cache(self, mock_get):
+        """Test that clearing the cache forces a new request."""
+        mock_get.return_value.content = orjson.dumps({})
+
+        client = OverpassClient()
+        client.query("[bbox:0,0,1,1];way;out;")
+        client.clear_query_cache()
+        client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_get.call_count == 2
+
+    @patch("src.clients.overpass_client.time.monotonic")
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_cache_entries_expire(self, mock_get, mock_monotonic):
+        """Test that entries older than the TTL are fetched again."""
+        mock_get.return_value.content = orjson.dumps({})
+        mock_monotonic.side_effect = [0.0, 599.0, 601.0]
+
+        client = OverpassClient()
+        for _ in range(3):
+            client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_get.call_count == 2
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_cache_evicts_oldest_entry(self, mock_get):
+        """Test that the cache is bounded."""
+        mock_get.return_value.content = orjson.dumps({})
+
+        client = OverpassClient(OverpassConfig(query_cache_size=2))
+        for q in ("a", "b", "c"):
+            client.query(q)
+
+        assert list(client._qcache) == ["b", "c"]
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_errors_are_not_cached(self, mock_get):
+        """Test that failed queries are not stored."""
+        mock_get.side_effect = requests.exceptions.Timeout()
+
+        client = OverpassClient()
+        with pytest.raises(requests.exceptions.Timeout):
+            client.query("[bbox:0,0,1,1];way;out;")
+
+        assert len(client._qcache) == 0
+
+
+class TestOverpassClientMapQueries:
+    """Test parallel query fan-out."""
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_map_queries_preserves_order(self, mock_get):
+        """Test that results are returned in query order."""
+        def fake_get(url, params, timeout):
+            response = Mock()
+            response.content = orjson.dumps({"q": params["data"]})
+            return response
+
+        mock_get.side_effect = fake_get
+
+        client = OverpassClient()
+        queries = [f"[bbox:0,0,{i},1];way;out;" for i in range(1, 9)]
+        results = client.map_queries(queries, max_workers=4)
+
+        assert [r["q"] for r in results] == queries
+        assert mock_get.call_count == 8
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_map_queries_parallel(self, mock_get):
+        """Test that queries overlap, up to max_workers at a time."""
+        barrier = threading.Barrier(3, timeout=5)
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def blocking_get(url, params, timeout):
+            with lock:
+                in_flight.append(params["data"])
+                peak.append(len(in_flight))
+            # Each wave of three queries must be in flight together
+            barrier.wait()
+            with lock:
+                in_flight.remove(params["data"])
+            response = Mock()
+            response.content = orjson.dumps({})
+            return response
+
+        mock_get.side_effect = blocking_get
+
+        client = OverpassClient()
+        queries = [f"[bbox:0,0,{i},1];way;out;" for i in range(1, 7)]
+        client.map_queries(queries, max_workers=3)
+
+        assert max(peak) == 3
+
+    @patch("src.clients.overpass_client.ThreadPoolExecutor")
+    @pytest.mark.parametrize(
+        "config,expected",
+        [
+            (OverpassConfig(pool_size=16), 2),
+            (OverpassConfig(pool_size=1), 1),
+            (OverpassConfig(pool_size=16, max_parallel_queries=8), 8),
+        ],
+    )
+    def test_map_queries_default_workers(self, mock_executor, config, expected):
+        """Test that workers follow pool_size, capped at the public slot limit."""
+        mock_executor.return_value.__enter__.return_value.map.return_value = []
+        client = OverpassClient(config)
+
+        client.map_queries([f"q{i}" for i in range(10)])
+
+        mock_executor.assert_called_once_with(max_workers=expected)
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_map_queries_shares_cache(self, mock_get):
+        """Test that identical queries in a batch reuse the cache."""
+        mock_get.return_value.content = orjson.dumps({"elements": []})
+
+        client = OverpassClient()
+        client.query("[bbox:0,0,1,1];way;out;")
+        results = client.map_queries(["[bbox:0,0,1,1];way;out;"] * 3)
+
+        assert results == [{"elements": []}] * 3
+        assert mock_get.call_count == 1
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_map_queries_propagates_errors(self, mock_get):
+        """Test that a failing query raises from map_queries."""
+        mock_get.side_effect = requests.exceptions.ConnectionError("down")
+
+        client = OverpassClient()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.map_queries(["[bbox:0,0,1,1];way;out;"])
+
+
+class TestOverpassClientQueryStream:
+    """Test OverpassClient.query_stream() method."""
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_stream_yields_elements(self, mock_get):
+        """Test that elements are decoded from the raw response stream."""
+        mock_response = Mock()
+        mock_response.raw = BytesIO(
+            b'{"version": 0.6, "elements": ['
+            b'{"type": "way", "id": 1, "geometry": [{"lat": 1.5, "lon": 2.5}]},'
+            b'{"type": "way", "id": 2}]}'
+        )
+        mock_get.return_value = mock_response
+
+        client = OverpassClient()
+        elements = list(client.query_stream("[bbox:0,0,1,1];way;out geom;"))
+
+        assert [e["id"] for e in elements] == [1, 2]
+        assert elements[0]["geometry"][0] == {"lat": 1.5, "lon": 2.5}
+        assert isinstance(elements[0]["geometry"][0]["lat"], float)
+        assert mock_get.call_args[1]["stream"] is True
+        mock_response.close.assert_called_once()
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_stream_is_incremental(self, mock_get):
+        """Test that the first elements are yielded before the body is read."""
+        body = orjson.dumps(
+            {"elements": [{"type": "way", "id": i} for i in range(20_000)]}
+        )
+        raw = BytesIO(body)
+        mock_get.return_value.raw = raw
+
+        client = OverpassClient()
+        stream = client.query_stream("[bbox:0,0,1,1];way;out;")
+        first = list(islice(stream, 3))
+
+        assert [e["id"] for e in first] == [0, 1, 2]
+        assert raw.tell() < len(body)
+
+        stream.close()
+        mock_get.return_value.close.assert_called_once()
+
+    @patch("src.clients.overpass_client.requests.Session.get")
+    def test_query_stream_raises_http_error(self, mock_get):
+        """Test that HTTP errors are raised before any element is yielded."""
+        mock_response = Mock()
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError()
+        mock_get.return_value = mock_response
+
+        client = OverpassClient()
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            list(client.query_stream("[bbox:0,0,1,1];way;out;"))
+        mock_response.close.assert_called_once()
+
+
+class TestOverpassClientRetry:
+    """Test the transport-level retry policy."""
+
+    @staticmethod
+    def _retry(client):
+        return client._session.get_adapter(client.config.url).max_retries
+
+    def test_retry_total_matches_max_retries(self):
+        """Test that max_retries is the total number of attempts."""
+        client = OverpassClient(config=OverpassConfig(max_retries=3))
+        assert self._retry(client).total == 2
+
+    def test_retry_uses_exponential_backoff(self):
+        """Test that the backoff factor comes from retry_delay."""
+        client = OverpassClient(config=OverpassConfig(retry_delay=2.0))
+        assert self._retry(client).backoff_factor == 2.0
+
+    def test_retry_backoff_is_jittered_and_capped(self):
+        """Test that backoff waits are jittered and never exceed max_delay."""
+        config = OverpassConfig(
+            max_retries=10, retry_delay=1.0, jitter=0.5, max_delay=5.0
+        )
+        retry = self._retry(OverpassClient(config=config))
+        assert retry.backoff_jitter == 0.5
+        assert retry.backoff_max == 5.0
+
+        retry = retry.increment("GET", "/", error=ConnectionError())
+        assert 1.0 <= retry.get_backoff_time() <= 1.5
+
+        retry = retry.increment("GET", "/", error=ConnectionError())
+        assert 2.0 <= retry.get_backoff_time() <= 2.5
+
+        for _ in range(6):
+            retry = retry.increment("GET", "/", error=ConnectionError())
+        assert retry.get_backoff_time() == 5.0
+
+    def test_retry_respects_retry_after(self):
+        """Test that Retry-After headers from Overpass are honored."""
+        retry = self._retry(OverpassClient())
+        assert retry.respect_retry_after_header is True
+        assert retry.is_retry("GET", 429, has_retry_after=True)
+
+    def test_retry_only_on_recoverable_status(self):
+        """Test that only 429/5xx responses are retried."""
+        retry = self._retry(OverpassClient())
+        assert retry.is_retry("GET", 503)
+        assert retry.is_retry("GET", 408)
+        assert not retry.is_retry("GET", 404)
+        assert not retry.is_retry("GET", 400)
+
+    @patch("urllib3.util.retry.Retry.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_query_retries_on_server_error(self, mock_request, mock_sleep):
+        """Test that the adapter retries 503 responses before succeeding."""
+        mock_request.side_effect = [
+            _raw_response(503),
+            _raw_response(503),
+            _raw_response(200, b'{"elements": []}'),
+        ]
+
+        client = OverpassClient(config=OverpassConfig(max_retries=3))
+        result = client.query("[bbox:0,0,1,1];way;out;")
+
+        assert result == {"elements": []}
+        assert mock_request.call_count == 3
+
+    @patch("urllib3.util.retry.time.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_query_exponential_backoff(self, mock_request, mock_sleep):
+        """Test that the first retry already waits, then the delay doubles."""
+        mock_request.side_effect = [
+            _raw_response(503),
+            _raw_response(503),
+            _raw_response(200, b'{"elements": []}'),
+        ]
+
+        config = OverpassConfig(max_retries=3, retry_delay=1.0, jitter=0.0)
+        OverpassClient(config=config).query("[bbox:0,0,1,1];way;out;")
+
+        calls = [call[0][0] for call in mock_sleep.call_args_list]
+        assert calls == [pytest.approx(1.0), pytest.approx(2.0)]
+
+    @patch("urllib3.util.retry.time.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_retry_after_is_capped(self, mock_request, mock_sleep):
+        """Test that a long Retry-After wait is capped at max_delay."""
+        throttled = _raw_response(429)
+        throttled.headers["Retry-After"] = "600"
+        mock_request.side_effect = [throttled, _raw_response(200)]
+
+        OverpassClient(config=OverpassConfig(max_delay=30.0)).query("q")
+
+        mock_sleep.assert_called_once_with(30.0)
+
+    @patch("urllib3.util.retry.Retry.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_query_does_not_retry_on_4xx(self, mock_request, mock_sleep):
+        """Test that a client error fails immediately without retrying."""
+        mock_request.return_value = _raw_response(404)
+
+        client = OverpassClient(config=OverpassConfig(max_retries=3))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_request.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_4xx_log_does_not_claim_retries(self, mock_request, caplog):
+        """Test that a single failed attempt is not logged as max_retries attempts."""
+        mock_request.return_value = _raw_response(404)
+
+        client = OverpassClient(config=OverpassConfig(max_retries=3))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.query("[bbox:0,0,1,1];way;out;")
+
+        assert "404" in caplog.text
+        assert "3 tentatives" not in caplog.text
+
+    @patch("urllib3.util.retry.Retry.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_query_raises_after_max_retries(self, mock_request, mock_sleep):
+        """Test that query raises once all attempts failed."""
+        mock_request.side_effect = [_raw_response(503), _raw_response(503)]
+
+        client = OverpassClient(config=OverpassConfig(max_retries=2))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.query("[bbox:0,0,1,1];way;out;")
+
+        assert mock_request.call_count == 2
 
 
 class TestOverpassClientIsAvailable:
     """Test OverpassClient.is_available() method."""
 
-    @patch("src.clients.overpass_client.requests.get")
-    def test_is_available_returns_true_for_200(self, mock_get):
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_returns_true_for_200(self, mock_request):
         """Test that is_available returns True for 200 status."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
+        mock_request.return_value.status = 200
 
         client = OverpassClient()
         assert client.is_available() is True
 
-    @patch("src.clients.overpass_client.requests.get")
-    def test_is_available_returns_false_for_non_200(self, mock_get):
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_returns_false_for_non_200(self, mock_request):
         """Test that is_available returns False for non-200 status."""
-        mock_response = Mock()
-        mock_response.status_code = 503
-        mock_get.return_value = mock_response
+        mock_request.return_value.status = 503
 
         client = OverpassClient()
         assert client.is_available() is False
 
-    @patch("src.clients.overpass_client.requests.get")
-    def test_is_available_returns_false_on_connection_error(self, mock_get):
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_returns_false_on_connection_error(self, mock_request):
         """Test that is_available returns False on connection error."""
-        mock_get.side_effect = requests.exceptions.ConnectionError()
+        mock_request.side_effect = NewConnectionError(None, "down")
 
         client = OverpassClient()
         assert client.is_available() is False
 
-    @patch("src.clients.overpass_client.requests.get")
-    def test_is_available_returns_false_on_timeout(self, mock_get):
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_returns_false_on_timeout(self, mock_request):
         """Test that is_available returns False on timeout."""
-        mock_get.side_effect = requests.exceptions.Timeout()
+        mock_request.side_effect = ConnectTimeoutError("timed out")
 
         client = OverpassClient()
         assert client.is_available() is False
 
-    @patch("src.clients.overpass_client.requests.get")
-    def test_is_available_uses_short_timeout(self, mock_get):
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_uses_short_timeout(self, mock_request):
         """Test that is_available uses a short timeout (5s)."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
+        mock_request.return_value.status = 200
 
         client = OverpassClient()
         client.is_available()
 
-        call_args = mock_get.call_args
-        assert call_args[1]["timeout"] == 5
\ No newline at end of file
+        assert mock_request.call_args[1]["timeout"] == 5
+
+    def test_is_available_uses_session_pool_and_headers(self):
+        """Test that the probe goes through the session's pooled adapter."""
+        client = OverpassClient()
+        adapter = client._session.get_adapter(client.config.url)
+        with patch.object(adapter.poolmanager, "request") as pool_request:
+            pool_request.return_value.status = 200
+            assert client.is_available() is True
+
+        pool_request.assert_called_once()
+        kwargs = pool_request.call_args[1]
+        assert kwargs["headers"]["User-Agent"].startswith("OverPassAPI/")
+        assert kwargs["retries"] is False
+
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_is_cached(self, mock_request):
+        """Test that repeated probes within the TTL reuse the result."""
+        mock_request.return_value.status = 200
+
+        client = OverpassClient()
+        assert client.is_available() is True
+        assert client.is_available() is True
+
+        assert mock_request.call_count == 1
+
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_caches_failures(self, mock_request):
+        """Test that an unavailable server is not probed again within the TTL."""
+        mock_request.side_effect = NewConnectionError(None, "down")
+
+        client = OverpassClient()
+        assert client.is_available() is False
+        assert client.is_available() is False
+
+        assert mock_request.call_count == 1
+
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_invalidate_availability_forces_probe(self, mock_request):
+        """Test that invalidate_availability triggers a new request."""
+        mock_request.return_value.status = 200
+
+        client = OverpassClient()
+        client.is_available()
+        client.invalidate_availability()
+        client.is_available()
+
+        assert mock_request.call_count == 2
+
+    @patch("urllib3.poolmanager.PoolManager.request")
+    def test_is_available_zero_ttl_disables_cache(self, mock_request):
+        """Test that a zero TTL probes the server on every call."""
+        mock_request.return_value.status = 200
+
+        client = OverpassClient(OverpassConfig(availability_ttl=0.0))
+        client.is_available()
+        client.is_available()
+
+        assert mock_request.call_count == 2
+
+    @patch("urllib3.util.retry.time.sleep")
+    @patch("urllib3.connectionpool.HTTPConnectionPool._make_request")
+    def test_is_available_does_not_retry(self, mock_request, mock_sleep):
+        """Test that the probe sends a single request, even on a 503."""
+        mock_request.return_value = _raw_response(503)
+
+        client = OverpassClient(config=OverpassConfig(max_retries=3))
+
+        assert client.is_available() is False
+        assert mock_request.call_count == 1
+        mock_sleep.assert_not_called()
+
+
+class TestOverpassClientHttpxBackend:
+    """Test the optional httpx (HTTP/2) backend."""
+
+    @staticmethod
+    def _client(handler, **config):
+        """Build an httpx-backed client whose requests go to handler."""
+        client = OverpassClient(OverpassConfig(http_backend="httpx", **config))
+        client.close()
+        client._session = httpx.Client(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_unknown_backend_is_rejected(self):
+        """Test that an unsupported backend name raises ValueError."""
+        with pytest.raises(ValueError):
+            OverpassClient(OverpassConfig(http_backend="urllib"))
+
+    def test_httpx_backend_uses_httpx_client(self):
+        """Test that the httpx backend builds an httpx.Client."""
+        client = OverpassClient(OverpassConfig(http_backend="httpx"))
+        assert isinstance(client._session, httpx.Client)
+        assert client._session.timeout.connect == 5.0
+        assert client._session.headers["User-Agent"].startswith("OverPassAPI/")
+        client.close()
+
+    def test_query(self):
+        """Test that a query is sent and decoded through httpx."""
+        def handler(request):
+            assert request.url.params["data"] == "[bbox:0,0,1,1];way;out;"
+            return httpx.Response(200, json={"elements": []})
+
+        client = self._client(handler)
+        assert client.query("[bbox:0,0,1,1];way;out;") == {"elements": []}
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_retries_server_errors(self, mock_sleep):
+        """Test that 503 responses are retried before succeeding."""
+        statuses = iter([503, 503, 200])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json={"elements": []})
+
+        client = self._client(handler, max_retries=3, retry_delay=1.0, jitter=0.0)
+
+        assert client.query("[bbox:0,0,1,1];way;out;") == {"elements": []}
+        calls = [call[0][0] for call in mock_sleep.call_args_list]
+        assert calls == [pytest.approx(1.0), pytest.approx(2.0)]
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_raises_after_max_retries(self, mock_sleep):
+        """Test that the last error response is raised once retries run out."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        client = self._client(handler, max_retries=2)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.query("[bbox:0,0,1,1];way;out;")
+        assert len(calls) == 2
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_does_not_retry_on_4xx(self, mock_sleep):
+        """Test that client errors fail on the first attempt."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        client = self._client(handler)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.query("[bbox:0,0,1,1];way;out;")
+        assert len(calls) == 1
+        mock_sleep.assert_not_called()
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_honors_retry_after(self, mock_sleep):
+        """Test that a Retry-After header sets the wait."""
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "7"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+        client = self._client(lambda request: next(responses))
+
+        client.query("[bbox:0,0,1,1];way;out;")
+
+        mock_sleep.assert_called_once_with(7)
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_caps_retry_after(self, mock_sleep):
+        """Test that a Retry-After wait longer than max_delay is capped."""
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "600"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+        client = self._client(lambda request: next(responses), max_delay=30.0)
+
+        client.query("[bbox:0,0,1,1];way;out;")
+
+        mock_sleep.assert_called_once_with(30.0)
+
+    def test_query_rejects_non_json_body(self, caplog):
+        """Test that an HTML error page raises a logged httpx.DecodingError."""
+        client = self._client(
+            lambda request: httpx.Response(200, content=b"<html>runtime error</html>")
+        )
+
+        with pytest.raises(httpx.DecodingError):
+            client.query("q")
+        assert [r.levelname for r in caplog.records] == ["WARNING"]
+
+    def test_query_stream(self):
+        """Test that elements are streamed from the httpx response."""
+        body = orjson.dumps({"elements": [{"id": 1}, {"id": 2}]})
+        client = self._client(lambda request: httpx.Response(200, content=body))
+
+        assert [e["id"] for e in client.query_stream("q")] == [1, 2]
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_stream_retries_server_errors(self, mock_sleep):
+        """Test that streamed queries retry 429/5xx like query()."""
+        body = orjson.dumps({"elements": [{"id": 1}]})
+        responses = iter(
+            [
+                httpx.Response(429),
+                httpx.Response(503),
+                httpx.Response(200, content=body),
+            ]
+        )
+        client = self._client(
+            lambda request: next(responses), max_retries=3, jitter=0.0
+        )
+
+        assert [e["id"] for e in client.query_stream("q")] == [1]
+        assert mock_sleep.call_count == 2
+
+    def test_query_stream_closes_response_on_retry_error(self):
+        """Test that a response is closed when deciding on a retry fails."""
+        closed = []
+
+        class Stream(httpx.SyncByteStream):
+            def __iter__(self):
+                yield b""
+
+            def close(self):
+                closed.append(True)
+
+        client = self._client(
+            lambda request: httpx.Response(
+                503, headers={"Retry-After": "soon"}, stream=Stream()
+            )
+        )
+
+        with pytest.raises(InvalidHeader):
+            list(client.query_stream("q"))
+        assert closed == [True]
+
+    @patch("src.clients.overpass_client.time.sleep")
+    def test_query_stream_raises_after_max_retries(self, mock_sleep):
+        """Test that the last error status is raised once retries run out."""
+        client = self._client(lambda request: httpx.Response(503), max_retries=2)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            list(client.query_stream("q"))
+        assert mock_sleep.call_count == 1
+
+    def test_is_available_uses_session(self):
+        """Test that the probe goes through the pooled httpx client."""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(503)
+
+        client = self._client(handler, max_retries=3)
+
+        assert client.is_available() is False
+        assert len(requests_seen) == 1
+
+    def test_is_available_handles_errors(self):
+        """Test that httpx transport errors mean unavailable."""
+        def handler(request):
+            raise httpx.ConnectError("down")
+
+        client = self._client(handler)
+        assert client.is_available() is False
+
+
+class TestAsyncOverpassClient:
+    """Test AsyncOverpassClient."""
+
+    def test_init_with_default_config(self):
+        """Test initialization with default config."""
+        client = AsyncOverpassClient()
+        assert client.config.url == "https://overpass-api.de/api/interpreter"
+
+    def test_pool_size_comes_from_config(self):
+        """Test that the connection limits follow pool_size."""
+        client = AsyncOverpassClient(OverpassConfig(pool_size=3))
+        pool = client._client._transport._pool
+        assert pool._max_connections == 3
+        assert pool._max_keepalive_connections == 3
+
+    def test_timeouts_split_connect_and_read(self):
+        """Test that connecting is bounded separately from reading."""
+        client = AsyncOverpassClient(OverpassConfig(timeout=60))
+        assert client._client.timeout.connect == 5.0
+        assert client._client.timeout.read == 60
+
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_returns_json(self, mock_get):
+        """Test that query returns the decoded JSON body."""
+        mock_get.return_value = _httpx_response(200, {"elements": []})
+
+        async def run():
+            async with AsyncOverpassClient() as client:
+                return await client.query("[bbox:0,0,1,1];way;out;")
+
+        assert asyncio.run(run()) == {"elements": []}
+        assert mock_get.call_args[1]["params"]["data"] == "[bbox:0,0,1,1];way;out;"
+
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_rejects_non_json_body(self, mock_get, caplog):
+        """Test that an HTML error page raises a logged httpx.DecodingError."""
+        mock_get.return_value = httpx.Response(
+            200,
+            content=b"<html>runtime error</html>",
+            request=httpx.Request("GET", "https://example.test"),
+        )
+
+        async def run():
+            async with AsyncOverpassClient() as client:
+                await client.query("[bbox:0,0,1,1];way;out;")
+
+        with pytest.raises(httpx.DecodingError):
+            asyncio.run(run())
+        assert [r.levelname for r in caplog.records] == ["WARNING"]
+
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_runs_concurrently(self, mock_get):
+        """Test that several queries can be awaited together."""
+        mock_get.return_value = _httpx_response(200, {"elements": []})
+
+        async def run():
+            async with AsyncOverpassClient() as client:
+                return await asyncio.gather(client.query("a"), client.query("b"))
+
+        assert asyncio.run(run()) == [{"elements": []}, {"elements": []}]
+        assert mock_get.call_count == 2
+
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_raises_http_error(self, mock_get):
+        """Test that HTTP errors are propagated."""
+        mock_get.side_effect = httpx.ConnectError("boom")
+
+        async def run():
+            async with AsyncOverpassClient() as client:
+                await client.query("[bbox:0,0,1,1];way;out;")
+
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(run())
+
+    @patch("src.clients.overpass_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_retries_server_errors(self, mock_get, mock_sleep):
+        """Test that 429/503 responses are retried with backoff."""
+        mock_get.side_effect = [
+            _httpx_response(429),
+            _httpx_response(503),
+            _httpx_response(200, {"elements": []}),
+        ]
+        config = OverpassConfig(max_retries=3, retry_delay=1.0, jitter=0.0)
+
+        async def run():
+            async with AsyncOverpassClient(config) as client:
+                return await client.query("[bbox:0,0,1,1];way;out;")
+
+        assert asyncio.run(run()) == {"elements": []}
+        calls = [call[0][0] for call in mock_sleep.call_args_list]
+        assert calls == [pytest.approx(1.0), pytest.approx(2.0)]
+
+    @patch("src.clients.overpass_client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.clients.overpass_client.httpx.AsyncClient.get", new_callable=AsyncMock)
+    def test_query_does_not_retry_on_4xx(self, mock_get, mock_sleep):
+        """Test that client errors fail on the first attempt."""
+        mock_get.return_value = _httpx_response(404)
+
+        async def run():
+            async with AsyncOverpassClient() as client:
+                await client.query("[bbox:0,0,1,1];way;out;")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
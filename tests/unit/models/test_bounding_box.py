@@ -1,7 +1,9 @@
 """Tests for BoundingBox model."""
 
+import dataclasses
+
 import pytest
-from src.models.bounding_box import BoundingBox
+from src.models.bounding_box import LAT_MAX, LAT_MIN, LON_MAX, LON_MIN, BoundingBox
 
 
 class TestBoundingBoxCreation:
@@ -27,6 +29,27 @@ class TestBoundingBoxCreation:
         assert bbox.lon_min == -180
 
 
+    def test_bbox_is_immutable(self, valid_bbox):
+        """Test that a bounding box cannot be modified after creation."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            valid_bbox.lat_min = 0.0
+
+    def test_bbox_is_hashable(self, valid_bbox):
+        """Test that equal bounding boxes hash equally."""
+        same = BoundingBox(
+            lat_min=valid_bbox.lat_min,
+            lon_min=valid_bbox.lon_min,
+            lat_max=valid_bbox.lat_max,
+            lon_max=valid_bbox.lon_max,
+        )
+        assert same == valid_bbox
+        assert len({same, valid_bbox}) == 1
+
+    def test_bbox_has_no_instance_dict(self, valid_bbox):
+        """Test that bounding boxes use slots instead of a __dict__."""
+        assert not hasattr(valid_bbox, "__dict__")
+
+
 class TestBoundingBoxValidation:
     """Test BoundingBox.is_valid() method."""
 
@@ -68,6 +91,10 @@ class TestBoundingBoxValidation:
         bbox = BoundingBox(lat_min=45.0, lon_min=2.0, lat_max=45.0, lon_max=2.0)
         assert bbox.is_valid() is False
 
+    def test_whole_world_is_valid(self):
+        """Test that the bbox spanning the coordinate bounds is valid."""
+        assert BoundingBox(LAT_MIN, LON_MIN, LAT_MAX, LON_MAX).is_valid() is True
+
     def test_boundary_latitude_90(self):
         """Test boundary latitude value of 90."""
         bbox = BoundingBox(lat_min=0, lon_min=0, lat_max=90, lon_max=10)
@@ -117,6 +144,22 @@ class TestBoundingBoxToOverpass:
         # Should be (lat_min, lon_min, lat_max, lon_max)
         assert result.startswith("(1.0,2.0,3.0,4.0)")
 
+    def test_equal_bboxes_share_hash(self):
+        """Test that equal bboxes compare and hash equal."""
+        first = BoundingBox(1.0, 2.0, 3.0, 4.0)
+        second = BoundingBox(1.0, 2.0, 3.0, 4.0)
+        assert first == second
+        assert hash(first) == hash(second)
+
+    def test_asdict_has_only_coordinates(self):
+        """Test that asdict exposes the four coordinates and nothing else."""
+        assert dataclasses.asdict(BoundingBox(1.0, 2.0, 3.0, 4.0)) == {
+            "lat_min": 1.0,
+            "lon_min": 2.0,
+            "lat_max": 3.0,
+            "lon_max": 4.0,
+        }
+
     def test_to_overpass_with_negative_values(self):
         """Test Overpass format with negative coordinates."""
         bbox = BoundingBox(lat_min=-45.0, lon_min=-90.0, lat_max=0.0, lon_max=0.0)
@@ -136,4 +179,33 @@ class TestBoundingBoxString:
     def test_repr_representation(self, paris_bbox):
         """Test __repr__ contains class name."""
         repr_str = repr(paris_bbox)
-        assert "BoundingBox" in repr_str or "(" in repr_str
\ No newline at end of file
+        assert "BoundingBox" in repr_str or "(" in repr_str
+
+class TestBoundingBoxSplit:
+    """Test BoundingBox.split() method."""
+
+    def test_split_tile_count(self, paris_bbox):
+        """Test that the grid has tiles_x * tiles_y tiles."""
+        assert len(paris_bbox.split(3, 2)) == 6
+
+    def test_split_single_tile(self, paris_bbox):
+        """Test that a 1x1 split returns the bbox itself."""
+        assert paris_bbox.split(1, 1) == [paris_bbox]
+
+    def test_split_covers_bbox(self):
+        """Test that tiles are contiguous and end on the exact bounds."""
+        bbox = BoundingBox(0.0, 0.0, 1.0, 0.3)
+        tiles = bbox.split(3, 1)
+
+        assert tiles[0].lon_min == 0.0
+        assert tiles[-1].lon_max == 0.3
+        for left, right in zip(tiles, tiles[1:]):
+            assert left.lon_max == right.lon_min
+        assert all(t.lat_min == 0.0 and t.lat_max == 1.0 for t in tiles)
+        assert all(t.is_valid() for t in tiles)
+
+    @pytest.mark.parametrize("tiles_x,tiles_y", [(0, 1), (1, 0), (-1, 2)])
+    def test_split_rejects_invalid_counts(self, paris_bbox, tiles_x, tiles_y):
+        """Test that tile counts below 1 are rejected."""
+        with pytest.raises(ValueError):
+            paris_bbox.split(tiles_x, tiles_y)
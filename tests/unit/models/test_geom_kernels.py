@@ -0,0 +1,41 @@
+"""Tests for geometry kernels."""
+
+import numpy as np
+import pytest
+from src.models._geom_kernels import _shoelace_loop, _shoelace_numpy, shoelace
+
+UNIT_SQUARE = np.array(
+    [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]
+)
+TRIANGLE = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, 1.0], [0.0, 0.0]])
+
+
+class TestShoelaceKernels:
+    """Test the shoelace implementations agree."""
+
+    @pytest.mark.parametrize("kernel", [shoelace, _shoelace_numpy, _shoelace_loop])
+    def test_unit_square(self, kernel):
+        """Test area of the unit square."""
+        assert kernel(UNIT_SQUARE) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("kernel", [shoelace, _shoelace_numpy, _shoelace_loop])
+    def test_triangle(self, kernel):
+        """Test area of a triangle."""
+        assert kernel(TRIANGLE) == pytest.approx(0.5)
+
+    @pytest.mark.parametrize("kernel", [shoelace, _shoelace_numpy, _shoelace_loop])
+    def test_clockwise_ring_is_positive(self, kernel):
+        """Test that orientation does not change the sign of the area."""
+        assert kernel(UNIT_SQUARE[::-1].copy()) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("kernel", [shoelace, _shoelace_numpy, _shoelace_loop])
+    def test_large_ring(self, kernel):
+        """Test a 10,000-vertex ring against the area of its circle."""
+        theta = np.linspace(0.0, 2 * np.pi, 10_001)
+        ring = np.column_stack((np.cos(theta), np.sin(theta)))
+        ring[-1] = ring[0]
+        assert kernel(ring) == pytest.approx(np.pi, rel=1e-6)
+
+    def test_kernel_returns_float(self):
+        """Test that the selected kernel returns a Python float."""
+        assert isinstance(shoelace(UNIT_SQUARE), float)
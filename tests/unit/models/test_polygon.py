@@ -1,5 +1,6 @@
 """Tests for Polygon model."""
 
+import numpy as np
 import pytest
 from src.models.polygon import Polygon, PolygonType
 
@@ -32,6 +33,80 @@ class TestPolygonCreation:
         assert poly.tags == {}
         assert poly.properties == {}
 
+    def test_coordinates_stored_as_float_array(self, simple_polygon):
+        """Test that coordinates are converted to a contiguous (n, 2) float64 array."""
+        coords = simple_polygon.coordinates
+        assert isinstance(coords, np.ndarray)
+        assert coords.shape == (5, 2)
+        assert coords.dtype == np.float64
+        assert coords.flags["C_CONTIGUOUS"]
+
+    def test_polygon_has_no_instance_dict(self, simple_polygon):
+        """Test that polygons use slots instead of a __dict__."""
+        assert not hasattr(simple_polygon, "__dict__")
+        with pytest.raises(AttributeError):
+            simple_polygon.extra = 1
+
+    def test_slotted_subclass_has_no_instance_dict(self):
+        """Test that a subclass declaring __slots__ stays dict-free."""
+        class Building(Polygon):
+            __slots__ = ()
+
+        poly = Building(osm_id=1, polygon_type=PolygonType.WAY)
+        assert not hasattr(poly, "__dict__")
+
+    def test_empty_coordinates_shape(self):
+        """Test that a polygon without coordinates holds an empty (0, 2) array."""
+        poly = Polygon(osm_id=1, polygon_type=PolygonType.WAY)
+        assert poly.coordinates.shape == (0, 2)
+
+    def test_empty_list_coordinates_shape(self):
+        """Test that an empty coordinate list becomes an empty (0, 2) array."""
+        poly = Polygon(osm_id=1, polygon_type=PolygonType.WAY, coordinates=[])
+        assert poly.coordinates.shape == (0, 2)
+
+    @pytest.mark.parametrize(
+        "coords",
+        [
+            [(0, 0, 10), (1, 0, 12), (1, 1, 11), (0, 0, 10)],
+            [0.0, 1.0, 2.0, 3.0],
+            [[[0, 0], [1, 1]]],
+        ],
+        ids=["3d_points", "flat", "nested"],
+    )
+    def test_non_pair_coordinates_are_rejected(self, coords):
+        """Test that coordinates not shaped as (lon, lat) pairs raise ValueError."""
+        with pytest.raises(ValueError):
+            Polygon(osm_id=1, polygon_type=PolygonType.WAY, coordinates=coords)
+
+    def test_coordinates_are_an_array_not_a_list(self, simple_polygon):
+        """Test the array contract: len() for emptiness, np.vstack to append."""
+        assert len(simple_polygon.coordinates) == 5
+        with pytest.raises(ValueError):
+            bool(simple_polygon.coordinates)
+
+        simple_polygon.coordinates = np.vstack(
+            (simple_polygon.coordinates, [[2.0, 2.0]])
+        )
+        assert simple_polygon.coordinates.shape == (6, 2)
+
+    def test_equal_polygons_compare_equal(self):
+        """Test equality between polygons built from lists and arrays."""
+        coords = [(0, 0), (1, 0), (1, 1), (0, 0)]
+        first = Polygon(osm_id=1, polygon_type=PolygonType.WAY, coordinates=coords)
+        second = Polygon(
+            osm_id=1, polygon_type=PolygonType.WAY, coordinates=np.array(coords)
+        )
+        assert first == second
+        assert first != Polygon(osm_id=1, polygon_type=PolygonType.WAY)
+
+    def test_x_y_are_column_views(self, simple_polygon):
+        """Test that x and y expose longitudes and latitudes without copying."""
+        assert simple_polygon.x.tolist() == simple_polygon.coordinates[:, 0].tolist()
+        assert simple_polygon.y.tolist() == simple_polygon.coordinates[:, 1].tolist()
+        assert np.shares_memory(simple_polygon.x, simple_polygon.coordinates)
+        assert np.shares_memory(simple_polygon.y, simple_polygon.coordinates)
+
 
 class TestPolygonIsClosed:
     """Test Polygon.is_closed() method."""
@@ -79,7 +154,7 @@ class TestPolygonClose:
         original_length = len(unclosed_polygon.coordinates)
         unclosed_polygon.close()
         assert len(unclosed_polygon.coordinates) == original_length + 1
-        assert unclosed_polygon.coordinates[0] == unclosed_polygon.coordinates[-1]
+        assert np.array_equal(unclosed_polygon.coordinates[0], unclosed_polygon.coordinates[-1])
         assert unclosed_polygon.is_closed() is True
 
     def test_close_already_closed_polygon(self, simple_polygon):
@@ -90,11 +165,23 @@ class TestPolygonClose:
         assert len(simple_polygon.coordinates) == original_length
 
     def test_close_modifies_coordinates(self, unclosed_polygon):
-        """Test that close() modifies the coordinates list."""
+        """Test that close() modifies the coordinates array."""
         original_coords = unclosed_polygon.coordinates.copy()
         unclosed_polygon.close()
-        assert unclosed_polygon.coordinates != original_coords
-        assert unclosed_polygon.coordinates[-1] == original_coords[0]
+        assert not np.array_equal(unclosed_polygon.coordinates, original_coords)
+        assert np.array_equal(unclosed_polygon.coordinates[-1], original_coords[0])
+
+    def test_close_already_closed_keeps_array(self, simple_polygon):
+        """Test that closing a closed polygon does not reallocate."""
+        coords = simple_polygon.coordinates
+        simple_polygon.close()
+        assert simple_polygon.coordinates is coords
+
+    def test_close_empty_polygon_is_noop(self):
+        """Test that closing a polygon without coordinates does nothing."""
+        poly = Polygon(osm_id=1, polygon_type=PolygonType.WAY)
+        poly.close()
+        assert poly.coordinates.shape == (0, 2)
 
 
 class TestPolygonIsValid:
@@ -135,6 +222,11 @@ class TestPolygonIsValid:
         )
         assert poly.is_valid() is False
 
+    def test_valid_matches_is_closed(self, simple_polygon, unclosed_polygon):
+        """Test that validity follows closedness for polygons of 3+ points."""
+        for poly in (simple_polygon, unclosed_polygon):
+            assert poly.is_valid() is poly.is_closed()
+
 
 class TestPolygonGetArea:
     """Test Polygon.get_area() method using Shoelace formula."""
@@ -168,6 +260,32 @@ class TestPolygonGetArea:
         area = unclosed_polygon.get_area()
         assert isinstance(area, (int, float))
 
+    def test_area_after_close(self, unclosed_polygon):
+        """Test that closing a polygon gives it its area."""
+        assert unclosed_polygon.get_area() == 0.0
+        unclosed_polygon.close()
+        assert unclosed_polygon.get_area() == pytest.approx(1.0)
+
+    def test_area_large_ring(self):
+        """Test area of a ring with many vertices (unit square sampled densely)."""
+        n = 250
+        edge = [i / n for i in range(n)]
+        coords = (
+            [(t, 0.0) for t in edge]
+            + [(1.0, t) for t in edge]
+            + [(1.0 - t, 1.0) for t in edge]
+            + [(0.0, 1.0 - t) for t in edge]
+            + [(0.0, 0.0)]
+        )
+        poly = Polygon(
+            osm_id=1,
+            polygon_type=PolygonType.WAY,
+            coordinates=coords,
+            tags={},
+            properties={},
+        )
+        assert poly.get_area() == pytest.approx(1.0)
+
     def test_area_empty_polygon(self):
         """Test area of polygon with empty coordinates."""
         poly = Polygon(
@@ -203,6 +321,18 @@ class TestPolygonToGeojson:
         assert "coordinates" in geojson["geometry"]
         assert len(geojson["geometry"]["coordinates"][0]) > 0
 
+    def test_geojson_coordinates_are_lists(self, simple_polygon):
+        """Test that GeoJSON coordinates are plain lists of [lon, lat]."""
+        geojson = simple_polygon.to_geojson_feature()
+        ring = geojson["geometry"]["coordinates"][0]
+        assert ring[0] == [0.0, 0.0]
+        assert ring[2] == [1.0, 1.0]
+
+    def test_geojson_coordinates_as_array(self, simple_polygon):
+        """Test that as_array keeps the NumPy coordinate array."""
+        geojson = simple_polygon.to_geojson_feature(as_array=True)
+        assert geojson["geometry"]["coordinates"][0] is simple_polygon.coordinates
+
     def test_geojson_properties_include_tags(self, simple_polygon):
         """Test that properties include tags."""
         geojson = simple_polygon.to_geojson_feature()
@@ -237,6 +367,37 @@ class TestPolygonToGeojson:
         assert geojson["type"] == "Feature"
         assert isinstance(geojson["properties"], dict)
 
+    def test_geojson_properties_follow_in_place_mutation(self, simple_polygon):
+        """Test that tags and properties mutated in place are exported."""
+        simple_polygon.to_geojson_feature()
+        simple_polygon.tags["building"] = "house"
+        simple_polygon.properties["height"] = 5
+
+        properties = simple_polygon.to_geojson_feature()["properties"]
+
+        assert properties["building"] == "house"
+        assert properties["height"] == 5
+
+    def test_geojson_properties_are_copies(self, simple_polygon):
+        """Test that mutating exported properties does not leak into later exports."""
+        first = simple_polygon.to_geojson_feature()
+        first["properties"]["building"] = "house"
+
+        second = simple_polygon.to_geojson_feature()
+
+        assert first["properties"] is not second["properties"]
+        assert second["properties"]["building"] == "yes"
+
+    def test_geojson_properties_follow_reassigned_tags(self, simple_polygon):
+        """Test that reassigned tags are exported."""
+        simple_polygon.to_geojson_feature()
+        simple_polygon.tags = {"amenity": "school"}
+
+        properties = simple_polygon.to_geojson_feature()["properties"]
+
+        assert properties["amenity"] == "school"
+        assert "building" not in properties
+
 
 class TestPolygonRepr:
     """Test Polygon string representation."""
@@ -1,5 +1,8 @@
 """Tests for PolygonType enum."""
 
+import json
+
+import orjson
 import pytest
 from src.models.polygon import PolygonType
 
@@ -49,4 +52,15 @@ class TestPolygonTypeEnum:
         members = [member.name for member in PolygonType]
         assert "WAY" in members
         assert "RELATION" in members
-        assert "NODE" in members
\ No newline at end of file
+        assert "NODE" in members
+
+    def test_polygon_type_is_a_string(self):
+        """Test that members are the strings themselves."""
+        assert isinstance(PolygonType.WAY, str)
+        assert PolygonType.WAY == "way"
+        assert str(PolygonType.RELATION) == "relation"
+
+    def test_polygon_type_serializes_as_value(self):
+        """Test that members serialize to their value in JSON."""
+        assert json.dumps({"type": PolygonType.WAY}) == '{"type": "way"}'
+        assert orjson.dumps({"type": PolygonType.NODE}) == b'{"type":"node"}'
@@ -1,27 +1,46 @@
 """Tests for PolygonRepository."""
 
+from types import MappingProxyType
+
+import numpy as np
 import pytest
-from unittest.mock import Mock, patch
-from src.repositories.polygon_repository import PolygonRepository
 from src.clients.overpass_client import OverpassClient
+from src.config import OverpassConfig
+from src.repositories.polygon_repository import PolygonRepository
 from src.models.polygon import Polygon, PolygonType
-from src.models.bounding_box import BoundingBox
+
+# Read-only: shared across tests, never mutated by the repository.
+_EMPTY_RESPONSE = MappingProxyType({"elements": []})
+_SAMPLE_WAY_RESPONSE = MappingProxyType({
+    "elements": [
+        {
+            "type": "way",
+            "id": 1,
+            "geometry": [
+                {"lat": 40.7128, "lon": -74.0060},
+                {"lat": 40.7580, "lon": -73.9855},
+            ],
+            "tags": {"building": "yes"},
+        }
+    ]
+})
+
+
+def _assert_cache_ids(repo, ids):
+    """Assert that the repository cache holds exactly the given ids."""
+    assert set(repo._cache.keys()) == set(ids)
 
 
 class TestPolygonRepositoryInit:
     """Test PolygonRepository initialization."""
 
-    def test_init_with_client(self):
+    def test_init_with_client(self, repo, mock_overpass_client):
         """Test initialization with OverpassClient."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-        assert repo.client == client
+        assert repo.client == mock_overpass_client
         assert repo._cache == {}
 
-    def test_init_creates_empty_cache(self):
+    def test_init_creates_empty_cache(self, repo):
         """Test that initialization creates empty cache."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
         assert isinstance(repo._cache, dict)
         assert len(repo._cache) == 0
 
@@ -29,11 +48,8 @@ class TestPolygonRepositoryInit:
 class TestPolygonRepositoryFindAll:
     """Test PolygonRepository.find_all() method."""
 
-    def test_find_all_raises_not_implemented(self):
+    def test_find_all_raises_not_implemented(self, repo):
         """Test that find_all raises NotImplementedError."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         with pytest.raises(NotImplementedError):
             repo.find_all()
 
@@ -41,20 +57,15 @@ class TestPolygonRepositoryFindAll:
 class TestPolygonRepositoryFindById:
     """Test PolygonRepository.find_by_id() method."""
 
-    def test_find_by_id_returns_cached_polygon(self, simple_polygon):
+    def test_find_by_id_returns_cached_polygon(self, repo, simple_polygon):
         """Test that find_by_id returns polygon from cache."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
         repo.save(simple_polygon)
 
         result = repo.find_by_id(123)
         assert result == simple_polygon
 
-    def test_find_by_id_returns_none_for_missing(self):
+    def test_find_by_id_returns_none_for_missing(self, repo):
         """Test that find_by_id returns None for missing polygon."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo.find_by_id(999)
         assert result is None
 
@@ -62,28 +73,19 @@ class TestPolygonRepositoryFindById:
 class TestPolygonRepositorySave:
     """Test PolygonRepository.save() method."""
 
-    def test_save_caches_polygon(self, simple_polygon):
+    def test_save_caches_polygon(self, repo, simple_polygon):
         """Test that save caches polygon by OSM ID."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo.save(simple_polygon)
         assert result == simple_polygon
-        assert repo.find_by_id(123) == simple_polygon
+        assert repo._cache.get(123) is simple_polygon
 
-    def test_save_returns_polygon(self, simple_polygon):
+    def test_save_returns_polygon(self, repo, simple_polygon):
         """Test that save returns the saved polygon."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo.save(simple_polygon)
         assert result is simple_polygon
 
-    def test_save_overwrites_existing(self, simple_polygon, triangle_polygon):
+    def test_save_overwrites_existing(self, repo, simple_polygon, triangle_polygon):
         """Test that save overwrites existing polygon with same ID."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         # Change triangle_polygon's ID to match simple_polygon
         triangle_polygon.osm_id = 123
 
@@ -91,27 +93,22 @@ class TestPolygonRepositorySave:
         repo.save(triangle_polygon)
 
         # Should return the second one
-        assert repo.find_by_id(123) == triangle_polygon
+        assert repo._cache.get(123) is triangle_polygon
 
 
 class TestPolygonRepositoryDelete:
     """Test PolygonRepository.delete() method."""
 
-    def test_delete_removes_from_cache(self, simple_polygon):
+    def test_delete_removes_from_cache(self, repo, simple_polygon):
         """Test that delete removes polygon from cache."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
         repo.save(simple_polygon)
 
         result = repo.delete(123)
         assert result is True
-        assert repo.find_by_id(123) is None
+        _assert_cache_ids(repo, [])
 
-    def test_delete_returns_false_for_missing(self):
+    def test_delete_returns_false_for_missing(self, repo):
         """Test that delete returns False for missing polygon."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo.delete(999)
         assert result is False
 
@@ -119,103 +116,244 @@ class TestPolygonRepositoryDelete:
 class TestPolygonRepositoryFindWays:
     """Test PolygonRepository.find_ways() method."""
 
-    def test_find_ways_with_valid_bbox(self, valid_bbox):
+    def test_find_ways_with_valid_bbox(self, repo, mock_overpass_client, valid_bbox):
         """Test find_ways with valid bounding box."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {
-            "elements": [
-                {
-                    "type": "way",
-                    "id": 1,
-                    "geometry": [
-                        {"lat": 40.7128, "lon": -74.0060},
-                        {"lat": 40.7580, "lon": -73.9855},
-                    ],
-                    "tags": {"building": "yes"},
-                }
-            ]
-        }
+        mock_overpass_client.query.return_value = _SAMPLE_WAY_RESPONSE
 
-        repo = PolygonRepository(client)
         results = repo.find_ways(valid_bbox)
 
-        assert len(results) > 0
-        assert all(isinstance(p, Polygon) for p in results)
-        client.query.assert_called_once()
+        assert results and type(results[0]) is Polygon
+        mock_overpass_client.query.assert_called_once()
 
-    def test_find_ways_with_invalid_bbox(self, invalid_bbox_reversed):
+    def test_find_ways_with_invalid_bbox(self, repo, invalid_bbox_reversed):
         """Test find_ways with invalid bounding box."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         with pytest.raises(ValueError):
             repo.find_ways(invalid_bbox_reversed)
 
-    def test_find_ways_with_custom_tags(self, valid_bbox):
+    def test_find_ways_with_custom_tags(self, repo, mock_overpass_client, valid_bbox):
         """Test find_ways with custom tags."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {"elements": []}
+        captured = []
+        mock_overpass_client.query.side_effect = (
+            lambda query, *args, **kwargs: captured.append(query) or _EMPTY_RESPONSE
+        )
 
-        repo = PolygonRepository(client)
         repo.find_ways(valid_bbox, tags={"landuse": "industrial"})
 
         # Check that query contains custom tags
-        call_args = client.query.call_args
-        assert 'landuse' in call_args[0][0]
-        assert 'industrial' in call_args[0][0]
+        assert len(captured) == 1
+        assert '["landuse"="industrial"]' in captured[0]
 
-    def test_find_ways_caches_results(self, valid_bbox):
+    def test_find_ways_caches_results(self, repo, mock_overpass_client, valid_bbox):
         """Test that find_ways caches results."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {
+        mock_overpass_client.query.return_value = _SAMPLE_WAY_RESPONSE
+
+        results = repo.find_ways(valid_bbox)
+
+        _assert_cache_ids(repo, [p.osm_id for p in results])
+        assert [p.osm_id for p in results] == [1]
+
+    def test_find_ways_stream_parses_elements(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
+        """Test that stream=True parses elements from query_stream."""
+        mock_overpass_client.query_stream.return_value = iter([
+            {
+                "type": "way",
+                "id": 1,
+                "geometry": [
+                    {"lat": 40.7128, "lon": -74.0060},
+                    {"lat": 40.7580, "lon": -73.9855},
+                ],
+                "tags": {"building": "yes"},
+            },
+            {"type": "node", "id": 2},
+        ])
+
+        results = repo.find_ways(valid_bbox, stream=True)
+
+        assert [p.osm_id for p in results] == [1]
+        assert repo._cache.get(1) is results[0]
+        mock_overpass_client.query.assert_not_called()
+
+    def test_find_ways_stream_handles_errors(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
+        """Test that a failing stream yields an empty list."""
+        mock_overpass_client.query_stream.side_effect = RuntimeError("boom")
+
+        assert repo.find_ways(valid_bbox, stream=True) == []
+
+    def test_find_ways_with_empty_response(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
+        """Test find_ways with empty API response."""
+        mock_overpass_client.query.return_value = _EMPTY_RESPONSE
+
+        results = repo.find_ways(valid_bbox)
+
+        assert results == []
+
+
+class TestPolygonRepositoryBuildWaysQuery:
+    """Test PolygonRepository.build_ways_query() method."""
+
+    def test_build_ways_query_contains_bbox_and_tags(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
+        """Test that the query targets the bbox and tags."""
+        query = repo.build_ways_query(valid_bbox, {"leisure": "park"})
+
+        assert valid_bbox.to_overpass() in query
+        assert 'way["leisure"="park"];' in query
+        assert "out geom;" in query
+        mock_overpass_client.query.assert_not_called()
+
+    def test_build_ways_query_defaults_to_buildings(self, repo, valid_bbox):
+        """Test that buildings are queried by default."""
+        assert '["building"="yes"]' in repo.build_ways_query(valid_bbox)
+
+    def test_build_ways_query_with_invalid_bbox(self, repo, invalid_bbox_reversed):
+        """Test that an invalid bbox is rejected."""
+        with pytest.raises(ValueError):
+            repo.build_ways_query(invalid_bbox_reversed)
+
+
+class TestPolygonRepositoryFindWaysUnion:
+    """Test PolygonRepository.find_ways_union() method."""
+
+    def test_build_union_query_has_one_statement_per_filter(self, repo, valid_bbox):
+        """Test that each tag set becomes a way statement of the union."""
+        query = repo.build_union_query(
+            valid_bbox, [{"building": "yes"}, {"leisure": "park"}]
+        )
+
+        assert query.count("way[") == 2
+        assert 'way["building"="yes"];' in query
+        assert 'way["leisure"="park"];' in query
+        assert query.count("out geom;") == 1
+
+    def test_find_ways_union_sends_one_query(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
+        """Test that the union is fetched in a single request."""
+        mock_overpass_client.query.return_value = _EMPTY_RESPONSE
+
+        assert repo.find_ways_union(valid_bbox, [{"a": "1"}, {"b": "2"}]) == []
+        mock_overpass_client.query.assert_called_once()
+
+    def test_find_ways_union_with_invalid_bbox(self, repo, invalid_bbox_reversed):
+        """Test that an invalid bbox is rejected."""
+        with pytest.raises(ValueError):
+            repo.find_ways_union(invalid_bbox_reversed, [{"a": "1"}])
+
+
+class TestPolygonRepositoryFindWaysMany:
+    """Test PolygonRepository.find_ways_many() method."""
+
+    def test_find_ways_many_sends_one_query_per_bbox(
+        self, repo, mock_overpass_client, valid_bbox, paris_bbox
+    ):
+        """Test that each bbox is queried through map_queries."""
+        mock_overpass_client.map_queries.return_value = [_EMPTY_RESPONSE, _EMPTY_RESPONSE]
+
+        assert repo.find_ways_many([valid_bbox, paris_bbox]) == []
+        (queries,), _ = mock_overpass_client.map_queries.call_args
+        assert len(queries) == 2
+
+    def test_find_ways_many_deduplicates(
+        self, repo, mock_overpass_client, valid_bbox, paris_bbox
+    ):
+        """Test that a way present in several tiles is returned once."""
+        way = {
+            "type": "way",
+            "id": 42,
+            "geometry": [
+                {"lat": 0, "lon": 0},
+                {"lat": 0, "lon": 1},
+                {"lat": 1, "lon": 1},
+                {"lat": 0, "lon": 0},
+            ],
+        }
+        mock_overpass_client.map_queries.return_value = [{"elements": [way]}, {"elements": [way]}]
+
+        result = repo.find_ways_many([valid_bbox, paris_bbox])
+
+        assert [p.osm_id for p in result] == [42]
+
+    def test_find_ways_many_with_invalid_bbox(
+        self, repo, mock_overpass_client, valid_bbox, invalid_bbox_reversed
+    ):
+        """Test that an invalid bbox is rejected before any request."""
+        with pytest.raises(ValueError):
+            repo.find_ways_many([valid_bbox, invalid_bbox_reversed])
+        mock_overpass_client.map_queries.assert_not_called()
+
+
+class TestPolygonRepositoryParseResponse:
+    """Test PolygonRepository.parse_response() method."""
+
+    def test_parse_response_filters_by_type_and_caches(self, repo):
+        """Test that only matching elements are parsed and cached."""
+        data = {
             "elements": [
                 {
                     "type": "way",
                     "id": 1,
-                    "geometry": [
-                        {"lat": 40.7128, "lon": -74.0060},
-                        {"lat": 40.7580, "lon": -73.9855},
-                    ],
-                    "tags": {"building": "yes"},
-                }
+                    "geometry": [{"lat": 0.0, "lon": 0.0}, {"lat": 1.0, "lon": 0.0}],
+                },
+                {"type": "node", "id": 2, "lat": 0.0, "lon": 0.0},
             ]
         }
 
-        repo = PolygonRepository(client)
-        results = repo.find_ways(valid_bbox)
+        polygons = repo.parse_response(data, PolygonType.WAY)
 
-        # Check that polygon is in cache
-        assert repo.find_by_id(1) is not None
-        assert len(results) == repo.get_cache_size()
+        assert [p.osm_id for p in polygons] == [1]
+        assert repo._cache.get(1) is polygons[0]
 
-    def test_find_ways_with_empty_response(self, valid_bbox):
-        """Test find_ways with empty API response."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {"elements": []}
+    def test_parse_response_handles_missing_elements(self, repo):
+        """Test that a response without elements yields no polygons."""
+        assert repo.parse_response({}, PolygonType.WAY) == []
 
-        repo = PolygonRepository(client)
-        results = repo.find_ways(valid_bbox)
+    def test_parse_response_rejects_non_list_elements(self, repo):
+        """Test that a malformed elements field yields no polygons."""
+        assert repo.parse_response({"elements": "oops"}, PolygonType.WAY) == []
 
-        assert results == []
+    def test_parse_response_skips_malformed_elements(self, repo, caplog):
+        """Test that a malformed element is logged and skipped."""
+        data = {
+            "elements": [
+                {"type": "way", "id": 1, "geometry": [{"lat": 0.0}]},
+                {
+                    "type": "way",
+                    "id": 2,
+                    "tags": None,
+                    "geometry": [{"lat": 0.0, "lon": 0.0}, {"lat": 1.0, "lon": 0.0}],
+                },
+            ]
+        }
+
+        with caplog.at_level("WARNING"):
+            polygons = repo.parse_response(data, PolygonType.WAY)
+
+        assert [p.osm_id for p in polygons] == [2]
+        assert polygons[0].tags == {}
+        assert "1" in caplog.text
 
 
 class TestPolygonRepositoryFindRelations:
     """Test PolygonRepository.find_relations() method."""
 
-    def test_find_relations_with_invalid_bbox(self, invalid_bbox_reversed):
+    def test_find_relations_with_invalid_bbox(self, repo, invalid_bbox_reversed):
         """Test find_relations with invalid bounding box."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         with pytest.raises(ValueError):
             repo.find_relations(invalid_bbox_reversed)
 
-    def test_find_relations_returns_empty_list(self, valid_bbox):
+    def test_find_relations_returns_empty_list(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
         """Test that find_relations returns empty list (not yet implemented)."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {"elements": []}
+        mock_overpass_client.query.return_value = _EMPTY_RESPONSE
 
-        repo = PolygonRepository(client)
         results = repo.find_relations(valid_bbox)
 
         assert results == []
@@ -224,26 +362,24 @@ class TestPolygonRepositoryFindRelations:
 class TestPolygonRepositoryFindByTags:
     """Test PolygonRepository.find_by_tags() method."""
 
-    def test_find_by_tags_delegates_to_find_ways(self, valid_bbox):
+    def test_find_by_tags_delegates_to_find_ways(
+        self, repo, mock_overpass_client, valid_bbox
+    ):
         """Test that find_by_tags delegates to find_ways."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {"elements": []}
+        mock_overpass_client.query.return_value = _EMPTY_RESPONSE
 
-        repo = PolygonRepository(client)
         tags = {"leisure": "park"}
         results = repo.find_by_tags(valid_bbox, tags)
 
         assert results == []
-        client.query.assert_called_once()
+        mock_overpass_client.query.assert_called_once()
 
 
 class TestPolygonRepositoryCacheOperations:
     """Test cache-related operations."""
 
-    def test_clear_cache(self, simple_polygon, triangle_polygon):
+    def test_clear_cache(self, repo, simple_polygon, triangle_polygon):
         """Test that clear_cache empties the cache."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
         repo.save(simple_polygon)
         repo.save(triangle_polygon)
 
@@ -251,43 +387,166 @@ class TestPolygonRepositoryCacheOperations:
         repo.clear_cache()
         assert repo.get_cache_size() == 0
 
-    def test_get_cache_size(self, simple_polygon, triangle_polygon):
+    def test_get_cache_size(self, repo, simple_polygon, triangle_polygon):
         """Test that get_cache_size returns correct count."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         assert repo.get_cache_size() == 0
         repo.save(simple_polygon)
         assert repo.get_cache_size() == 1
         repo.save(triangle_polygon)
         assert repo.get_cache_size() == 2
 
+    def test_default_cache_size_from_config(self, repo):
+        """Test that the cache size defaults to the configured value."""
+        assert repo.cache_size == 10_000
+
+    def test_cache_size_from_client_config(self):
+        """Test that the client's configured cache size is used."""
+        client = OverpassClient(OverpassConfig(cache_size=5))
+
+        assert PolygonRepository(client).cache_size == 5
+
+    def test_zero_cache_size_disables_cache(self, mock_overpass_client, simple_polygon):
+        """Test that cache_size=0 is honored rather than replaced by the default."""
+        repo = PolygonRepository(mock_overpass_client, cache_size=0)
+
+        repo.save(simple_polygon)
+
+        assert repo.cache_size == 0
+        _assert_cache_ids(repo, [])
+
+    def test_cache_evicts_least_recently_saved(
+        self, mock_overpass_client, simple_polygon, triangle_polygon, park_polygon
+    ):
+        """Test that the oldest entry is evicted when the cache is full."""
+        repo = PolygonRepository(mock_overpass_client, cache_size=2)
+
+        repo.save(simple_polygon)
+        repo.save(triangle_polygon)
+        repo.save(park_polygon)
+
+        _assert_cache_ids(repo, [789, 999])
+        assert repo._cache[789] is triangle_polygon
+        assert repo._cache[999] is park_polygon
+
+    def test_find_by_id_refreshes_entry(
+        self, mock_overpass_client, simple_polygon, triangle_polygon, park_polygon
+    ):
+        """Test that a cache hit protects the entry from eviction."""
+        repo = PolygonRepository(mock_overpass_client, cache_size=2)
+
+        repo.save(simple_polygon)
+        repo.save(triangle_polygon)
+        repo.find_by_id(123)
+        repo.save(park_polygon)
+
+        _assert_cache_ids(repo, [123, 999])
+
+
+class TestPolygonRepositoryDiskCache:
+    """Test the persistent diskcache backend."""
+
+    def test_polygons_survive_new_repository(
+        self, mock_overpass_client, tmp_path, simple_polygon
+    ):
+        """Test that a saved polygon is found by a later repository."""
+        pytest.importorskip("diskcache")
+
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as repo:
+            repo.save(simple_polygon)
+
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as reopened:
+            assert reopened.find_by_id(simple_polygon.osm_id) == simple_polygon
+            assert reopened.get_cache_size() == 1
+
+    def test_responses_survive_new_repository(
+        self, mock_overpass_client, tmp_path, valid_bbox
+    ):
+        """Test that a query answered in an earlier run is not sent again."""
+        pytest.importorskip("diskcache")
+        # The disk cache pickles responses, which a mappingproxy cannot be
+        mock_overpass_client.query.return_value = dict(_SAMPLE_WAY_RESPONSE)
+
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as repo:
+            first = repo.find_ways(valid_bbox)
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as reopened:
+            second = reopened.find_ways(valid_bbox)
+
+        mock_overpass_client.query.assert_called_once()
+        assert second == first
+
+    def test_failed_query_is_not_cached(
+        self, mock_overpass_client, tmp_path, valid_bbox
+    ):
+        """Test that an error response is not stored in the disk cache."""
+        pytest.importorskip("diskcache")
+        mock_overpass_client.query.side_effect = [
+            RuntimeError("boom"),
+            dict(_SAMPLE_WAY_RESPONSE),
+        ]
+
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as repo:
+            assert repo.find_ways(valid_bbox) == []
+            assert len(repo.find_ways(valid_bbox)) == 1
+
+    def test_cache_size_rejected_with_cache_dir(self, mock_overpass_client, tmp_path):
+        """Test that a polygon count limit is refused for the disk cache."""
+        with pytest.raises(ValueError, match="cache_size"):
+            PolygonRepository(
+                mock_overpass_client, cache_size=10, cache_dir=str(tmp_path)
+            )
+
+    def test_delete_and_clear(
+        self, mock_overpass_client, tmp_path, simple_polygon, triangle_polygon
+    ):
+        """Test that delete and clear_cache work on the disk cache."""
+        pytest.importorskip("diskcache")
+        with PolygonRepository(mock_overpass_client, cache_dir=str(tmp_path)) as repo:
+            repo.save(simple_polygon)
+            repo.save(triangle_polygon)
+
+            assert repo.delete(simple_polygon.osm_id) is True
+            assert repo.delete(simple_polygon.osm_id) is False
+            repo.clear_cache()
+            assert repo.get_cache_size() == 0
+
 
 class TestPolygonRepositoryPrivateMethods:
     """Test private methods of PolygonRepository."""
 
-    def test_build_tag_conditions_single_tag(self):
+    def test_build_tag_conditions_single_tag(self, repo):
         """Test _build_tag_conditions with single tag."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo._build_tag_conditions({"building": "yes"})
         assert result == '["building"="yes"]'
 
-    def test_build_tag_conditions_multiple_tags(self):
+    def test_build_tag_conditions_multiple_tags(self, repo):
         """Test _build_tag_conditions with multiple tags."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
-
         result = repo._build_tag_conditions({"building": "yes", "levels": "5"})
-        assert '["building"="yes"]' in result
-        assert '["levels"="5"]' in result
 
-    def test_parse_element_creates_valid_polygon(self):
-        """Test that _parse_element creates a valid polygon."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
+        assert result.startswith("[") and result.endswith("]")
+        assert sorted(result[1:-1].split("][")) == ['"building"="yes"', '"levels"="5"']
+
+    def test_build_tag_conditions_ignores_key_order(self, repo):
+        """Test that tag order does not change the generated conditions."""
+        first = repo._build_tag_conditions({"building": "yes", "levels": "5"})
+        second = repo._build_tag_conditions({"levels": "5", "building": "yes"})
+
+        assert first == second
+
+    def test_build_tag_conditions_is_memoized(self, repo):
+        """Test that equal tag sets reuse the same conditions string."""
+        first = repo._build_tag_conditions({"amenity": "school", "name": "A"})
+        second = repo._build_tag_conditions({"name": "A", "amenity": "school"})
+
+        assert first is second
+
+    def test_build_tag_conditions_escapes_quotes(self, repo):
+        """Test that quotes and backslashes in values are escaped."""
+        result = repo._build_tag_conditions({"name": 'Rue "A" \\ B'})
 
+        assert result == '["name"="Rue \\"A\\" \\\\ B"]'
+
+    def test_parse_element_creates_valid_polygon(self, repo):
+        """Test that _parse_element creates a valid polygon."""
         element = {
             "type": "way",
             "id": 123,
@@ -305,21 +564,103 @@ class TestPolygonRepositoryPrivateMethods:
         assert polygon.polygon_type == PolygonType.WAY
         assert polygon.tags == {"building": "yes"}
 
-    def test_parse_element_handles_missing_geometry(self):
-        """Test that _parse_element returns None for missing geometry."""
-        client = Mock(spec=OverpassClient)
-        repo = PolygonRepository(client)
+    def test_parse_element_builds_closed_lon_lat_array(self, repo):
+        """Test that parsed coordinates are a closed (n, 2) [lon, lat] array."""
+        element = {
+            "type": "way",
+            "id": 123,
+            "geometry": [
+                {"lat": 40.0, "lon": -74.0},
+                {"lat": 40.1, "lon": -74.0},
+                {"lat": 40.1, "lon": -73.9},
+            ],
+        }
+
+        polygon = repo._parse_element(element, PolygonType.WAY)
+
+        assert polygon.coordinates.shape == (4, 2)
+        assert polygon.coordinates[1].tolist() == [-74.0, 40.1]
+        assert polygon.coordinates.dtype == np.float64
+        assert polygon.coordinates.flags.c_contiguous
+        assert polygon.is_closed() is True
 
+    def test_parse_element_keeps_closed_way_as_is(self, repo):
+        """Test that an already closed way is not closed twice."""
+        element = {
+            "id": 1,
+            "geometry": [
+                {"lat": 0.0, "lon": 0.0},
+                {"lat": 0.0, "lon": 1.0},
+                {"lat": 1.0, "lon": 1.0},
+                {"lat": 0.0, "lon": 0.0},
+            ],
+        }
+
+        polygon = repo._parse_element(element, PolygonType.WAY)
+
+        assert len(polygon.coordinates) == 4
+
+    def test_parse_element_does_not_close_relations(self, repo):
+        """Test that only ways are closed while parsing."""
+        element = {
+            "id": 1,
+            "geometry": [
+                {"lat": 0.0, "lon": 0.0},
+                {"lat": 0.0, "lon": 1.0},
+                {"lat": 1.0, "lon": 1.0},
+            ],
+        }
+
+        polygon = repo._parse_element(element, PolygonType.RELATION)
+
+        assert len(polygon.coordinates) == 3
+
+    def test_parse_element_interns_tag_strings(self, repo):
+        """Test that equal tags share their strings but not their dict."""
+        geometry = [{"lat": 0.0, "lon": 0.0}, {"lat": 1.0, "lon": 0.0}]
+        # Build equal but distinct strings, as a JSON decoder would
+        key, value = "".join(["buil", "ding"]), "".join(["y", "es"])
+
+        first = repo._parse_element(
+            {"id": 1, "geometry": geometry, "tags": {"building": "yes"}},
+            PolygonType.WAY,
+        )
+        second = repo._parse_element(
+            {"id": 2, "geometry": geometry, "tags": {key: value}},
+            PolygonType.WAY,
+        )
+
+        (first_key, first_value), = first.tags.items()
+        (second_key, second_value), = second.tags.items()
+        assert first_key is second_key
+        assert first_value is second_value
+        assert first.tags is not second.tags
+
+    def test_parsed_tags_are_independent(self, repo):
+        """Test that editing one polygon's tags leaves the others alone."""
+        geometry = [{"lat": 0.0, "lon": 0.0}, {"lat": 1.0, "lon": 0.0}]
+        first, second = repo._parse_elements(
+            [
+                {"type": "way", "id": i, "geometry": geometry, "tags": {"building": "yes"}}
+                for i in (1, 2)
+            ],
+            PolygonType.WAY,
+        )
+
+        first.tags["name"] = "x"
+
+        assert second.tags == {"building": "yes"}
+
+    def test_parse_element_handles_missing_geometry(self, repo):
+        """Test that _parse_element returns None for missing geometry."""
         element = {"type": "way", "id": 123, "tags": {"building": "yes"}}
 
         polygon = repo._parse_element(element, PolygonType.WAY)
         assert polygon is None
 
-    def test_query_and_parse_handles_empty_response(self):
+    def test_query_and_parse_handles_empty_response(self, repo, mock_overpass_client):
         """Test that _query_and_parse handles empty response."""
-        client = Mock(spec=OverpassClient)
-        client.query.return_value = {}
-        repo = PolygonRepository(client)
+        mock_overpass_client.query.return_value = {}
 
         results = repo._query_and_parse("[bbox:0,0,1,1];way;out;", PolygonType.WAY)
         assert results == []
\ No newline at end of file
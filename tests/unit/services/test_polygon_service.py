@@ -1,228 +1,237 @@
 """Tests for PolygonService."""
 
+import asyncio
+import orjson
 import pytest
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
+from src.clients.overpass_client import AsyncOverpassClient
 from src.services.polygon_service import PolygonService
-from src.repositories.polygon_repository import PolygonRepository
-from src.models.polygon import Polygon, PolygonType
 
 
 class TestPolygonServiceInit:
     """Test PolygonService initialization."""
 
-    def test_init_with_repository(self):
+    def test_init_with_repository(self, mock_repo):
         """Test initialization with PolygonRepository."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-        assert service.repository == repo
+        service = PolygonService(mock_repo)
+        assert service.repository == mock_repo
 
 
-class TestPolygonServiceGetBuildings:
-    """Test PolygonService.get_buildings() method."""
+class TestPolygonServiceTagWrappers:
+    """Test the get_buildings/get_industrial_zones/get_water_areas/get_parks wrappers."""
 
-    def test_get_buildings(self, valid_bbox):
-        """Test get_buildings calls repository with correct tags."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_ways.return_value = []
-        service = PolygonService(repo)
+    @pytest.mark.parametrize(
+        "method,tags",
+        [
+            ("get_buildings", {"building": "yes"}),
+            ("get_industrial_zones", {"landuse": "industrial"}),
+            ("get_water_areas", {"natural": "water"}),
+            ("get_parks", {"leisure": "park"}),
+        ],
+    )
+    def test_wrapper_queries_ways_with_tags(self, mock_repo, valid_bbox, method, tags):
+        """Test that each wrapper calls find_ways with its tags."""
+        mock_repo.find_ways.return_value = []
 
-        service.get_buildings(valid_bbox)
+        getattr(PolygonService(mock_repo), method)(valid_bbox)
 
-        repo.find_ways.assert_called_once_with(valid_bbox, {"building": "yes"})
+        mock_repo.find_ways.assert_called_once_with(valid_bbox, tags)
 
-    def test_get_buildings_returns_buildings(self, valid_bbox, simple_polygon):
+    def test_get_buildings_returns_buildings(
+        self, mock_repo, valid_bbox, simple_polygon
+    ):
         """Test get_buildings returns buildings from repository."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_ways.return_value = [simple_polygon]
-        service = PolygonService(repo)
+        mock_repo.find_ways.return_value = [simple_polygon]
+        service = PolygonService(mock_repo)
 
         result = service.get_buildings(valid_bbox)
 
         assert result == [simple_polygon]
 
 
-class TestPolygonServiceGetIndustrialZones:
-    """Test PolygonService.get_industrial_zones() method."""
-
-    def test_get_industrial_zones(self, valid_bbox):
-        """Test get_industrial_zones calls repository with correct tags."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_ways.return_value = []
-        service = PolygonService(repo)
-
-        service.get_industrial_zones(valid_bbox)
-
-        repo.find_ways.assert_called_once_with(valid_bbox, {"landuse": "industrial"})
-
-
-class TestPolygonServiceGetWaterAreas:
-    """Test PolygonService.get_water_areas() method."""
-
-    def test_get_water_areas(self, valid_bbox):
-        """Test get_water_areas calls repository with correct tags."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_ways.return_value = []
-        service = PolygonService(repo)
-
-        service.get_water_areas(valid_bbox)
-
-        repo.find_ways.assert_called_once_with(valid_bbox, {"natural": "water"})
-
-
-class TestPolygonServiceGetParks:
-    """Test PolygonService.get_parks() method."""
-
-    def test_get_parks(self, valid_bbox):
-        """Test get_parks calls repository with correct tags."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_ways.return_value = []
-        service = PolygonService(repo)
-
-        service.get_parks(valid_bbox)
-
-        repo.find_ways.assert_called_once_with(valid_bbox, {"leisure": "park"})
-
-
 class TestPolygonServiceGetPolygonsByTags:
     """Test PolygonService.get_polygons_by_tags() method."""
 
-    def test_get_polygons_by_tags(self, valid_bbox):
+    def test_get_polygons_by_tags(self, mock_repo, valid_bbox):
         """Test get_polygons_by_tags calls repository with custom tags."""
-        repo = Mock(spec=PolygonRepository)
-        repo.find_by_tags.return_value = []
-        service = PolygonService(repo)
+        mock_repo.find_by_tags.return_value = []
+        service = PolygonService(mock_repo)
 
         custom_tags = {"name": "Custom"}
         service.get_polygons_by_tags(valid_bbox, custom_tags)
 
-        repo.find_by_tags.assert_called_once_with(valid_bbox, custom_tags)
+        mock_repo.find_by_tags.assert_called_once_with(valid_bbox, custom_tags)
 
 
-class TestPolygonServiceFilterByArea:
-    """Test PolygonService.filter_by_area() method."""
+class TestPolygonServiceGetMultiLayers:
+    """Test PolygonService.get_multi_layers() method."""
 
-    def test_filter_by_area_min_only(self, polygon_list):
-        """Test filtering by minimum area only."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+    def test_get_multi_layers_uses_single_union_query(self, mock_repo, valid_bbox):
+        """Test that all layers are fetched with one repository call."""
+        mock_repo.find_ways_union.return_value = []
+        service = PolygonService(mock_repo)
 
-        # polygon_list has areas: 1.0, 1.0, 4.0
-        result = service.filter_by_area(polygon_list, min_area=2.0)
+        layers = {"buildings": {"building": "yes"}, "parks": {"leisure": "park"}}
+        result = service.get_multi_layers(valid_bbox, layers)
 
-        assert len(result) == 1
-        assert result[0].osm_id == 3
+        assert result == {"buildings": [], "parks": []}
+        mock_repo.find_ways_union.assert_called_once_with(
+            valid_bbox, [{"building": "yes"}, {"leisure": "park"}]
+        )
 
-    def test_filter_by_area_min_and_max(self, polygon_list):
-        """Test filtering by min and max area."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+    def test_get_multi_layers_routes_by_tags(
+        self, mock_repo, valid_bbox, simple_polygon, park_polygon
+    ):
+        """Test that polygons are routed to the layers whose tags they match."""
+        mock_repo.find_ways_union.return_value = [simple_polygon, park_polygon]
+        service = PolygonService(mock_repo)
 
-        # polygon_list has areas: 1.0, 1.0, 4.0
-        result = service.filter_by_area(polygon_list, min_area=0.5, max_area=2.0)
+        layers = {
+            "buildings": {"building": "yes"},
+            "parks": {"leisure": "park"},
+            "water": {"natural": "water"},
+        }
+        result = service.get_multi_layers(valid_bbox, layers)
 
-        assert len(result) == 2
-        assert all(p.osm_id in [1, 2] for p in result)
+        assert result["buildings"] == [simple_polygon]
+        assert result["parks"] == [park_polygon]
+        assert result["water"] == []
 
-    def test_filter_by_area_empty_list(self):
-        """Test filtering empty list."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+    def test_get_multi_layers_without_layers(self, mock_repo, valid_bbox):
+        """Test that no request is sent when no layer is requested."""
+        service = PolygonService(mock_repo)
 
-        result = service.filter_by_area([], min_area=1.0)
+        assert service.get_multi_layers(valid_bbox, {}) == {}
+        mock_repo.find_ways_union.assert_not_called()
 
-        assert result == []
 
-    def test_filter_by_area_no_matches(self, polygon_list):
-        """Test filtering with no matches."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+class TestPolygonServiceFindWaysTiled:
+    """Test PolygonService.find_ways_tiled() method."""
 
-        result = service.filter_by_area(polygon_list, min_area=100.0)
+    def test_find_ways_tiled_queries_every_tile(
+        self, mock_repo, paris_bbox, simple_polygon
+    ):
+        """Test that the bbox is split and the tiles fetched together."""
+        mock_repo.find_ways_many.return_value = [simple_polygon]
+        service = PolygonService(mock_repo)
 
-        assert result == []
+        result = service.find_ways_tiled(paris_bbox, 2, 2, {"building": "yes"})
 
+        assert result == [simple_polygon]
+        mock_repo.find_ways_many.assert_called_once_with(
+            paris_bbox.split(2, 2), {"building": "yes"}
+        )
 
-class TestPolygonServiceFilterByTagValue:
-    """Test PolygonService.filter_by_tag_value() method."""
 
-    def test_filter_by_tag_value(self, polygon_list):
-        """Test filtering by tag value."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+class TestPolygonServiceGetLayersAsync:
+    """Test PolygonService.get_layers_async() method."""
 
-        # All polygons in polygon_list have building=yes
-        result = service.filter_by_tag_value(polygon_list, "building", "yes")
+    def test_get_layers_async_queries_each_layer(
+        self, mock_repo, valid_bbox, simple_polygon
+    ):
+        """Test that one query is sent per layer and results keep layer order."""
+        mock_repo.build_ways_query.side_effect = lambda bbox, tags: str(tags)
+        mock_repo.parse_response.side_effect = lambda data, _: data["polygons"]
+        client = Mock(spec=AsyncOverpassClient)
+        client.query = AsyncMock(
+            side_effect=lambda q: {"polygons": [simple_polygon] if "building" in q else []}
+        )
+        service = PolygonService(mock_repo)
 
-        assert len(result) == 3
-        assert all(p.tags.get("building") == "yes" for p in result)
+        layers = [{"building": "yes"}, {"leisure": "park"}]
+        result = asyncio.run(service.get_layers_async(valid_bbox, layers, client))
 
-    def test_filter_by_tag_value_no_matches(self, polygon_list):
-        """Test filtering by tag value with no matches."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+        assert result == [[simple_polygon], []]
+        assert client.query.await_count == 2
+        mock_repo.build_ways_query.assert_any_call(valid_bbox, {"leisure": "park"})
 
-        result = service.filter_by_tag_value(polygon_list, "building", "apartment")
 
-        assert result == []
+class TestPolygonServiceFilterByArea:
+    """Test PolygonService.filter_by_area() method."""
 
-    def test_filter_by_tag_value_empty_list(self):
+    # polygon_list has areas: 1.0, 1.0, 4.0
+    @pytest.mark.parametrize(
+        "min_area,max_area,expected_ids",
+        [
+            (2.0, None, [3]),
+            (0.5, 2.0, [1, 2]),
+            (100.0, None, []),
+        ],
+        ids=["min_only", "min_and_max", "no_matches"],
+    )
+    def test_filter_by_area(
+        self, service, polygon_list, min_area, max_area, expected_ids
+    ):
+        """Test filtering polygon_list by area bounds."""
+        result = service.filter_by_area(
+            polygon_list, min_area=min_area, max_area=max_area
+        )
+
+        assert [p.osm_id for p in result] == expected_ids
+
+    def test_filter_by_area_accepts_generator(self, service, polygon_list):
+        """Test that any iterable of polygons is accepted, not only sequences."""
+        result = service.filter_by_area((p for p in polygon_list), min_area=2.0)
+
+        assert [p.osm_id for p in result] == [3]
+
+    def test_filter_by_area_empty_list(self, service):
         """Test filtering empty list."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
-        result = service.filter_by_tag_value([], "building", "yes")
+        result = service.filter_by_area([], min_area=1.0)
 
         assert result == []
 
-    def test_filter_by_tag_value_missing_tag(self, simple_polygon):
-        """Test filtering when tag is missing."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
 
-        polygons = [simple_polygon]
-        result = service.filter_by_tag_value(polygons, "nonexistent", "value")
+class TestPolygonServiceFilterByTagValue:
+    """Test PolygonService.filter_by_tag_value() method."""
 
-        assert result == []
+    @pytest.mark.parametrize(
+        "polygons,tag_key,tag_value,expected_ids",
+        [
+            # All polygons in polygon_list have building=yes
+            ("polygon_list", "building", "yes", [1, 2, 3]),
+            ("polygon_list", "building", "apartment", []),
+            (None, "building", "yes", []),
+            ("simple_polygon", "nonexistent", "value", []),
+        ],
+        ids=["matches", "no_matches", "empty_list", "missing_tag"],
+        indirect=["polygons"],
+    )
+    def test_filter_by_tag_value(
+        self, service, polygons, tag_key, tag_value, expected_ids
+    ):
+        """Test filtering by tag value."""
+        result = service.filter_by_tag_value(polygons, tag_key, tag_value)
+
+        assert [p.osm_id for p in result] == expected_ids
 
 
 class TestPolygonServiceConvertToGeojson:
     """Test PolygonService.convert_to_geojson() method."""
 
-    def test_convert_to_geojson_structure(self, polygon_list):
+    def test_convert_to_geojson_structure(self, service, polygon_list):
         """Test GeoJSON structure is correct."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.convert_to_geojson(polygon_list)
 
         assert result["type"] == "FeatureCollection"
         assert "features" in result
         assert isinstance(result["features"], list)
 
-    def test_convert_to_geojson_features_count(self, polygon_list):
+    def test_convert_to_geojson_features_count(self, service, polygon_list):
         """Test that all polygons are converted to features."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.convert_to_geojson(polygon_list)
 
         assert len(result["features"]) == len(polygon_list)
 
-    def test_convert_to_geojson_empty_list(self):
+    def test_convert_to_geojson_empty_list(self, service):
         """Test converting empty list."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.convert_to_geojson([])
 
         assert result["type"] == "FeatureCollection"
         assert result["features"] == []
 
-    def test_convert_to_geojson_preserves_properties(self, simple_polygon):
+    def test_convert_to_geojson_preserves_properties(self, service, simple_polygon):
         """Test that properties are preserved in GeoJSON."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.convert_to_geojson([simple_polygon])
 
         feature = result["features"][0]
@@ -230,14 +239,28 @@ class TestPolygonServiceConvertToGeojson:
         assert feature["properties"]["osm_id"] == 123
 
 
+class TestPolygonServiceToGeojsonBytes:
+    """Test PolygonService.to_geojson_bytes() method."""
+
+    def test_to_geojson_bytes_matches_dict_output(self, service, polygon_list):
+        """Test that the encoded collection decodes to convert_to_geojson output."""
+        result = service.to_geojson_bytes(polygon_list)
+
+        assert isinstance(result, bytes)
+        assert orjson.loads(result) == service.convert_to_geojson(polygon_list)
+
+    def test_to_geojson_bytes_empty_list(self, service):
+        """Test encoding an empty collection."""
+        result = orjson.loads(service.to_geojson_bytes([]))
+
+        assert result == {"type": "FeatureCollection", "features": []}
+
+
 class TestPolygonServiceGetStatistics:
     """Test PolygonService.get_statistics() method."""
 
-    def test_get_statistics_empty_list(self):
+    def test_get_statistics_empty_list(self, service):
         """Test statistics for empty list."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.get_statistics([])
 
         assert result["count"] == 0
@@ -246,11 +269,8 @@ class TestPolygonServiceGetStatistics:
         assert result["max_area"] == 0.0
         assert result["total_area"] == 0.0
 
-    def test_get_statistics_single_polygon(self, simple_polygon):
+    def test_get_statistics_single_polygon(self, service, simple_polygon):
         """Test statistics for single polygon."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.get_statistics([simple_polygon])
 
         assert result["count"] == 1
@@ -259,11 +279,8 @@ class TestPolygonServiceGetStatistics:
         assert result["max_area"] == 1.0
         assert result["total_area"] == 1.0
 
-    def test_get_statistics_multiple_polygons(self, polygon_list):
+    def test_get_statistics_multiple_polygons(self, service, polygon_list):
         """Test statistics for multiple polygons."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
-
         result = service.get_statistics(polygon_list)
 
         assert result["count"] == 3
@@ -272,11 +289,27 @@ class TestPolygonServiceGetStatistics:
         assert result["min_area"] == pytest.approx(1.0, abs=0.01)
         assert result["max_area"] == pytest.approx(4.0, abs=0.01)
 
-    def test_get_statistics_has_required_keys(self, polygon_list):
-        """Test that statistics has all required keys."""
-        repo = Mock(spec=PolygonRepository)
-        service = PolygonService(repo)
+    def test_get_statistics_accepts_generator(self, service, polygon_list):
+        """Test that statistics can be computed from a generator."""
+        result = service.get_statistics(p for p in polygon_list)
 
+        assert result["count"] == 3
+        assert result["total_area"] == pytest.approx(6.0, abs=0.01)
+
+    def test_get_statistics_matches_get_area(
+        self, service, polygon_list, triangle_polygon, unclosed_polygon
+    ):
+        """Test that batched areas match Polygon.get_area for each polygon."""
+        polygons = [*polygon_list, triangle_polygon, unclosed_polygon]
+        result = service.get_statistics(polygons)
+
+        areas = [p.get_area() for p in polygons]
+        assert result["total_area"] == pytest.approx(sum(areas))
+        assert result["min_area"] == pytest.approx(min(areas))
+        assert result["max_area"] == pytest.approx(max(areas))
+
+    def test_get_statistics_has_required_keys(self, service, polygon_list):
+        """Test that statistics has all required keys."""
         result = service.get_statistics(polygon_list)
 
         required_keys = ["count", "avg_area", "min_area", "max_area", "total_area"]
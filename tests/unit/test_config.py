@@ -7,46 +7,40 @@ from src.config import OverpassConfig, DEFAULT_CONFIG
 class TestOverpassConfig:
     """Test OverpassConfig dataclass."""
 
-    def test_default_config_url(self):
-        """Test default API URL."""
-        config = OverpassConfig()
-        assert config.url == "https://overpass-api.de/api/interpreter"
-
-    def test_default_config_timeout(self):
-        """Test default timeout."""
-        config = OverpassConfig()
-        assert config.timeout == 30
-
-    def test_default_config_max_retries(self):
-        """Test default max retries."""
-        config = OverpassConfig()
-        assert config.max_retries == 3
-
-    def test_default_config_retry_delay(self):
-        """Test default retry delay."""
-        config = OverpassConfig()
-        assert config.retry_delay == 1.0
-
-    def test_custom_url(self):
-        """Test custom API URL."""
-        custom_url = "https://custom.api/overpass"
-        config = OverpassConfig(url=custom_url)
-        assert config.url == custom_url
-
-    def test_custom_timeout(self):
-        """Test custom timeout."""
-        config = OverpassConfig(timeout=60)
-        assert config.timeout == 60
-
-    def test_custom_max_retries(self):
-        """Test custom max retries."""
-        config = OverpassConfig(max_retries=5)
-        assert config.max_retries == 5
-
-    def test_custom_retry_delay(self):
-        """Test custom retry delay."""
-        config = OverpassConfig(retry_delay=2.5)
-        assert config.retry_delay == 2.5
+    @pytest.mark.parametrize(
+        "attr,expected",
+        [
+            ("url", "https://overpass-api.de/api/interpreter"),
+            ("timeout", 30),
+            ("max_retries", 3),
+            ("retry_delay", 1.0),
+            ("jitter", 0.5),
+            ("max_delay", 30.0),
+            ("cache_size", 10_000),
+            ("pool_size", 16),
+            ("max_parallel_queries", None),
+            ("availability_ttl", 30.0),
+            ("query_cache_size", 256),
+            ("query_cache_ttl", 600.0),
+            ("http_backend", "requests"),
+        ],
+    )
+    def test_default_value(self, attr, expected):
+        """Test the default value of each configuration field."""
+        assert getattr(OverpassConfig(), attr) == expected
+
+    @pytest.mark.parametrize(
+        "attr,value",
+        [
+            ("url", "https://custom.api/overpass"),
+            ("timeout", 60),
+            ("max_retries", 5),
+            ("retry_delay", 2.5),
+        ],
+    )
+    def test_custom_value(self, attr, value):
+        """Test that a field can be overridden at construction."""
+        assert getattr(OverpassConfig(**{attr: value}), attr) == value
 
     def test_all_custom_values(self):
         """Test setting all custom values."""